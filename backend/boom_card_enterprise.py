@@ -9,26 +9,37 @@ This is a production-ready FastAPI backend with:
 - Scalable architecture patterns
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.security import OAuth2PasswordBearer
+from brotli_asgi import BrotliMiddleware
 from contextlib import asynccontextmanager
-from sqlalchemy import create_engine, Column, String, Integer, Boolean, DateTime, Text, JSON, ForeignKey, Enum, Numeric, func
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker, Session
+from sqlalchemy import String, Integer, Boolean, DateTime, Text, JSON, ForeignKey, Enum, Numeric, Index, func, select, text, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, load_only, selectinload
+from sqlalchemy.pool import NullPool
 from sqlalchemy.dialects.postgresql import UUID
-from pydantic import BaseModel, EmailStr, Field, validator
-from passlib.context import CryptContext
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from sqlalchemy.exc import IntegrityError
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
 from enum import Enum as PyEnum
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+import bcrypt
+import hashlib
+import jwt
+import orjson
 import uuid
 import logging
 import os
+import string
+import time
 from dataclasses import dataclass
 
 # Configure logging
@@ -45,37 +56,71 @@ class Settings:
     refresh_token_expire_days: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
     cors_origins: List[str] = os.getenv("CORS_ORIGINS", "https://boom-card.netlify.app,http://localhost:3000,http://localhost:3001").split(",")
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    # Per-worker pool: (expected concurrent requests / workers) * 0.3-0.5
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # Set when connecting through PgBouncer in transaction mode to avoid double pooling
+    db_use_pgbouncer: bool = os.getenv("DB_USE_PGBOUNCER", "false").lower() == "true"
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 settings = Settings()
 
 # Algorithm for JWT
 ALGORITHM = "HS256"
+SECRET_KEY_BYTES = settings.secret_key.encode()
 
-# Database setup
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+# Verified access tokens -> (user_id, exp), most recently used last
+TOKEN_CACHE_SIZE = 50_000
+_verified_tokens: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Database setup (async engine so DB waits don't block the event loop)
+if settings.db_use_pgbouncer:
+    # PgBouncer owns the pooling; transaction mode can't keep prepared statements
+    engine_options = {
+        "poolclass": NullPool,
+        "connect_args": {"statement_cache_size": 0}
+    }
+else:
+    engine_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_timeout": settings.db_pool_timeout
+    }
+
+engine = create_async_engine(
+    settings.database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+    **engine_options
+)
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+class Base(DeclarativeBase):
+    pass
+
+# Cached authenticated-user lookups (cache-aside in Redis)
+USER_CACHE_TTL_SECONDS = 300
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # ===================== DATABASE MODELS =====================
 
 class TimestampMixin:
     """Mixin for adding created_at and updated_at timestamps"""
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Fetch server-generated timestamps via RETURNING at flush time; with
+    # AsyncSession a later implicit refresh would be blocking lazy I/O.
+    __mapper_args__ = {"eager_defaults": True}
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 class UserStatus(PyEnum):
     ACTIVE = "active"
@@ -88,6 +133,9 @@ class SubscriptionType(PyEnum):
     PREMIUM = "premium"
     ENTERPRISE = "enterprise"
 
+# Display labels for the legacy "membershipType" field
+MEMBERSHIP_LABELS = {t: t.value.title() for t in SubscriptionType}
+
 class DiscountType(PyEnum):
     PERCENTAGE = "percentage"
     FIXED_AMOUNT = "fixed_amount"
@@ -102,135 +150,163 @@ class TransactionStatus(PyEnum):
 class User(Base, TimestampMixin):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email = Column(String(255), unique=True, nullable=False, index=True)
-    phone_number = Column(String(20), unique=True, nullable=True, index=True)
-    first_name = Column(String(100), nullable=False)
-    last_name = Column(String(100), nullable=False)
-    hashed_password = Column(String(255), nullable=False)
-    status = Column(Enum(UserStatus), default=UserStatus.PENDING_VERIFICATION, nullable=False)
-    subscription_type = Column(Enum(SubscriptionType), default=SubscriptionType.FREE, nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    phone_number: Mapped[Optional[str]] = mapped_column(String(20), unique=True, index=True)
+    first_name: Mapped[str] = mapped_column(String(100))
+    last_name: Mapped[str] = mapped_column(String(100))
+    hashed_password: Mapped[str] = mapped_column(String(255))
+    status: Mapped[UserStatus] = mapped_column(Enum(UserStatus), default=UserStatus.PENDING_VERIFICATION)
+    subscription_type: Mapped[SubscriptionType] = mapped_column(Enum(SubscriptionType), default=SubscriptionType.FREE)
     
     # Profile information
-    date_of_birth = Column(DateTime, nullable=True)
-    preferences = Column(JSON, default=dict, nullable=False) 
-    notification_settings = Column(JSON, default=dict, nullable=False)
+    date_of_birth: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    preferences: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
+    notification_settings: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
     
     # Verification
-    email_verified = Column(Boolean, default=False, nullable=False)
-    verification_token = Column(String(255), nullable=True)
+    email_verified: Mapped[bool] = mapped_column(Boolean, default=False)
+    verification_token: Mapped[Optional[str]] = mapped_column(String(255))
     
     # Security
-    last_login = Column(DateTime(timezone=True), nullable=True)
-    failed_login_attempts = Column(Integer, default=0, nullable=False)
-    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_login: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    failed_login_attempts: Mapped[int] = mapped_column(Integer, default=0)
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
     # Relationships
-    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
-    favorites = relationship("UserFavorite", back_populates="user", cascade="all, delete-orphan")
+    transactions: Mapped[List["Transaction"]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    favorites: Mapped[List["UserFavorite"]] = relationship(back_populates="user", cascade="all, delete-orphan")
 
 class Partner(Base, TimestampMixin):
     __tablename__ = "partners"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    business_name = Column(String(200), nullable=False)
-    business_type = Column(String(100), nullable=False) 
-    email = Column(String(255), unique=True, nullable=False)
-    phone_number = Column(String(20), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    business_name: Mapped[str] = mapped_column(String(200))
+    business_type: Mapped[str] = mapped_column(String(100))
+    email: Mapped[str] = mapped_column(String(255), unique=True)
+    phone_number: Mapped[str] = mapped_column(String(20))
     
     # Business details
-    description = Column(Text, nullable=True)
-    website = Column(String(500), nullable=True)
-    logo_url = Column(String(500), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    website: Mapped[Optional[str]] = mapped_column(String(500))
+    logo_url: Mapped[Optional[str]] = mapped_column(String(500))
     
     # Location (JSON: {street, city, state, zip, country, coordinates})
-    address = Column(JSON, nullable=False)
+    address: Mapped[Dict[str, Any]] = mapped_column(JSON)
     
     # Business verification
-    is_verified = Column(Boolean, default=False, nullable=False)
-    verification_documents = Column(JSON, default=list, nullable=False)
+    is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
+    verification_documents: Mapped[List[Any]] = mapped_column(JSON, default=list)
     
     # Business hours (JSON: {monday: {open: "09:00", close: "17:00"}, ...})
-    business_hours = Column(JSON, default=dict, nullable=False)
+    business_hours: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
     
     # Relationships
-    discounts = relationship("Discount", back_populates="partner", cascade="all, delete-orphan")
+    discounts: Mapped[List["Discount"]] = relationship(back_populates="partner", cascade="all, delete-orphan")
 
 class Discount(Base, TimestampMixin):
     __tablename__ = "discounts"
+    __table_args__ = (
+        Index("ix_discounts_partner_active_valid", "partner_id", "is_active", "valid_until"),
+        Index("ix_discounts_valid_until_active", "valid_until", postgresql_where=text("is_active")),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    partner_id = Column(UUID(as_uuid=True), ForeignKey("partners.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    partner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("partners.id"))
     
-    title = Column(String(200), nullable=False)
-    description = Column(Text, nullable=False)
-    discount_type = Column(Enum(DiscountType), nullable=False)
-    discount_value = Column(Numeric(10, 2), nullable=False)
+    title: Mapped[str] = mapped_column(String(200))
+    description: Mapped[str] = mapped_column(Text)
+    discount_type: Mapped[DiscountType] = mapped_column(Enum(DiscountType))
+    discount_value: Mapped[Decimal] = mapped_column(Numeric(10, 2))
     
     # Validity
-    valid_from = Column(DateTime(timezone=True), nullable=False)
-    valid_until = Column(DateTime(timezone=True), nullable=False) 
-    is_active = Column(Boolean, default=True, nullable=False)
+    valid_from: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    valid_until: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     
     # Usage limits
-    max_uses_per_user = Column(Integer, nullable=True)
-    max_total_uses = Column(Integer, nullable=True)
-    current_uses = Column(Integer, default=0, nullable=False)
+    max_uses_per_user: Mapped[Optional[int]] = mapped_column(Integer)
+    max_total_uses: Mapped[Optional[int]] = mapped_column(Integer)
+    current_uses: Mapped[int] = mapped_column(Integer, default=0)
     
     # Terms and conditions
-    terms_conditions = Column(Text, nullable=True)
-    minimum_purchase = Column(Numeric(10, 2), nullable=True)
+    terms_conditions: Mapped[Optional[str]] = mapped_column(Text)
+    minimum_purchase: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
     
     # QR Code
-    qr_code_data = Column(Text, nullable=True)
+    qr_code_data: Mapped[Optional[str]] = mapped_column(Text)
     
     # Categories and tags
-    categories = Column(JSON, default=list, nullable=False)
-    tags = Column(JSON, default=list, nullable=False)
+    categories: Mapped[List[str]] = mapped_column(JSON, default=list)
+    tags: Mapped[List[str]] = mapped_column(JSON, default=list)
     
-    # Relationships
-    partner = relationship("Partner", back_populates="discounts")
-    transactions = relationship("Transaction", back_populates="discount")
+    # Relationships (partner must be eager-loaded, see DiscountService)
+    partner: Mapped["Partner"] = relationship(back_populates="discounts", lazy="raise")
+    transactions: Mapped[List["Transaction"]] = relationship(back_populates="discount")
 
 class Transaction(Base, TimestampMixin):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_user_id", "user_id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    discount_id = Column(UUID(as_uuid=True), ForeignKey("discounts.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"))
+    discount_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("discounts.id"))
     
     # Transaction details
-    original_amount = Column(Numeric(10, 2), nullable=False)
-    discount_amount = Column(Numeric(10, 2), nullable=False)
-    final_amount = Column(Numeric(10, 2), nullable=False)
+    original_amount: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    discount_amount: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    final_amount: Mapped[Decimal] = mapped_column(Numeric(10, 2))
     
     # Status tracking
-    status = Column(Enum(TransactionStatus), default=TransactionStatus.COMPLETED, nullable=False)
+    status: Mapped[TransactionStatus] = mapped_column(Enum(TransactionStatus), default=TransactionStatus.COMPLETED)
     
     # Location and device info
-    location_data = Column(JSON, nullable=True)
-    device_info = Column(JSON, nullable=True)
+    location_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)
+    device_info: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)
     
     # Additional data
-    transaction_metadata = Column(JSON, default=dict, nullable=False)
+    transaction_metadata: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
     
     # Relationships
-    user = relationship("User", back_populates="transactions")
-    discount = relationship("Discount", back_populates="transactions")
+    user: Mapped["User"] = relationship(back_populates="transactions")
+    discount: Mapped["Discount"] = relationship(back_populates="transactions")
 
 class UserFavorite(Base, TimestampMixin):
     __tablename__ = "user_favorites"
+    __table_args__ = (
+        Index("ix_user_favorites_user_id", "user_id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    discount_id = Column(UUID(as_uuid=True), ForeignKey("discounts.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"))
+    discount_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("discounts.id"))
     
     # Relationships
-    user = relationship("User", back_populates="favorites")
-    discount = relationship("Discount")
+    user: Mapped["User"] = relationship(back_populates="favorites")
+    discount: Mapped["Discount"] = relationship()
+
+# Column sets for auth lookups: skip the JSON preferences/settings blobs and
+# verification token. Anything read from these rows must be listed here, since
+# a lazy load of a deferred column is not allowed under AsyncSession.
+AUTH_USER_COLUMNS = load_only(
+    User.id, User.email, User.phone_number, User.hashed_password, User.status,
+    User.subscription_type, User.email_verified, User.first_name, User.last_name,
+    User.created_at, User.last_login, User.failed_login_attempts, User.locked_until
+)
+CURRENT_USER_COLUMNS = load_only(
+    User.id, User.email, User.first_name, User.last_name, User.status,
+    User.subscription_type, User.email_verified, User.created_at
+)
 
 # ===================== PYDANTIC SCHEMAS =====================
 
+# Password policy character classes
+_PASSWORD_DIGITS = frozenset(string.digits)
+_PASSWORD_UPPER = frozenset(string.ascii_uppercase)
+_PASSWORD_SPECIAL = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
+
 # Auth schemas
 class UserRegistrationRequest(BaseModel):
     email: EmailStr = Field(..., description="User email address")
@@ -240,20 +316,29 @@ class UserRegistrationRequest(BaseModel):
     password: str = Field(..., min_length=8, description="Password")
     date_of_birth: Optional[datetime] = Field(None, description="Date of birth")
     
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
-        if not any(char.isdigit() for char in v):
+        has_digit = has_upper = has_special = False
+        for char in v:
+            has_digit |= char in _PASSWORD_DIGITS
+            has_upper |= char in _PASSWORD_UPPER
+            has_special |= char in _PASSWORD_SPECIAL
+            if has_digit and has_upper and has_special:
+                return v
+        if not has_digit:
             raise ValueError('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
+        if not has_upper:
             raise ValueError('Password must contain at least one uppercase letter') 
-        if not any(char in "!@#$%^&*()_+-=[]{}|;:,.<>?" for char in v):
-            raise ValueError('Password must contain at least one special character')
-        return v
+        raise ValueError('Password must contain at least one special character')
 
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
 
+# Response schemas are built from our own DB rows and tokens, so handlers use
+# model_construct() to skip re-validation. Only trusted, server-originated data
+# may go through model_construct; request schemas are always validated.
 class UserResponse(BaseModel):
     id: str
     email: EmailStr
@@ -265,8 +350,7 @@ class UserResponse(BaseModel):
     email_verified: bool
     created_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class LoginResponse(BaseModel):
     access_token: str
@@ -296,8 +380,7 @@ class PartnerResponse(BaseModel):
     is_verified: bool
     created_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Discount schemas  
 class DiscountRequest(BaseModel):
@@ -328,47 +411,127 @@ class DiscountResponse(BaseModel):
     categories: List[str]
     tags: List[str]
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ===================== AUTHENTICATION UTILITIES =====================
 
+# bcrypt is CPU-bound; callers on the event loop go through run_in_threadpool
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=settings.bcrypt_rounds)).decode()
 
 def create_access_token(user: User) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
     to_encode = {
         "sub": str(user.id),
         "email": user.email,
         "type": "access",
         "exp": expire
     }
-    return jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
 
 def create_refresh_token(user: User) -> str:
-    expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+    expire = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
     to_encode = {
         "sub": str(user.id),
         "type": "refresh", 
         "exp": expire
     }
-    return jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
 
 def verify_token(token: str) -> Optional[str]:
+    # Keyed on the whole token: a partial key would let a forged token that
+    # shares a suffix with a verified one skip signature verification.
+    cached = _verified_tokens.get(token)
+    if cached is not None:
+        user_id, exp = cached
+        if exp > time.time():
+            _verified_tokens.move_to_end(token)
+            return user_id
+        del _verified_tokens[token]
+    
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-        return user_id
-    except JWTError:
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
         return None
+    
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return None
+    
+    _verified_tokens[token] = (user_id, payload.get("exp", 0))
+    if len(_verified_tokens) > TOKEN_CACHE_SIZE:
+        _verified_tokens.popitem(last=False)
+    return user_id
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+@dataclass
+class CurrentUser:
+    """Authenticated user fields needed by request handlers (cacheable)"""
+    id: uuid.UUID
+    email: str
+    first_name: str
+    last_name: str
+    status: UserStatus
+    subscription_type: SubscriptionType
+    email_verified: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            status=user.status,
+            subscription_type=user.subscription_type,
+            email_verified=user.email_verified,
+            created_at=user.created_at
+        )
+
+    def to_cache(self) -> bytes:
+        return orjson.dumps({
+            "id": str(self.id),
+            "email": self.email,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "status": self.status.value,
+            "subscription_type": self.subscription_type.value,
+            "email_verified": self.email_verified,
+            "created_at": self.created_at
+        })
+
+    @classmethod
+    def from_cache(cls, raw: bytes) -> "CurrentUser":
+        data = orjson.loads(raw)
+        return cls(
+            id=uuid.UUID(data["id"]),
+            email=data["email"],
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            status=UserStatus(data["status"]),
+            subscription_type=SubscriptionType(data["subscription_type"]),
+            email_verified=data["email_verified"],
+            created_at=datetime.fromisoformat(data["created_at"])
+        )
+
+def user_cache_key(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+async def invalidate_cached_user(redis: Redis, user_id: Any) -> None:
+    """Drop a cached user, e.g. after a password or status change"""
+    try:
+        await redis.delete(user_cache_key(user_id))
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate cached user {user_id}: {e}")
+
+async def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
@@ -378,31 +541,55 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     user_id = verify_token(token)
     if user_id is None:
         raise credentials_exception
+    
+    redis: Redis = request.app.state.redis
+    cache_key = user_cache_key(user_id)
+    try:
+        cached = await redis.get(cache_key)
+        if cached is not None:
+            return CurrentUser.from_cache(cached)
+    except RedisError as e:
+        logger.warning(f"User cache read failed, falling back to database: {e}")
         
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).options(CURRENT_USER_COLUMNS).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
+    
+    current_user = CurrentUser.from_user(user)
+    # Tokens are verified on every request, so the TTL only bounds profile staleness
+    ttl = min(USER_CACHE_TTL_SECONDS, settings.access_token_expire_minutes * 60)
+    try:
+        await redis.setex(cache_key, ttl, current_user.to_cache())
+    except RedisError as e:
+        logger.warning(f"User cache write failed: {e}")
         
-    return user
+    return current_user
 
 # ===================== SERVICES =====================
 
 class UserService:
-    def __init__(self, db: Session):
+    """User persistence and authentication.
+    
+    Methods run on the event loop: database access must be awaited through
+    the AsyncSession and CPU-bound work (bcrypt) offloaded to the threadpool.
+    Never call blocking I/O directly from these coroutines.
+    """
+    
+    def __init__(self, db: AsyncSession):
         self.db = db
     
     async def create_user(self, user_data: UserRegistrationRequest) -> User:
-        # Check if user exists
-        existing_user = self.db.query(User).filter(
-            (User.email == user_data.email) | 
-            (User.phone_number == user_data.phone_number)
-        ).first()
-        
-        if existing_user:
+        # Check if user exists: one indexed probe per unique column instead of an OR
+        if await self.db.scalar(select(User.id).where(User.email == user_data.email).limit(1)):
+            raise ValueError("User already exists")
+        if user_data.phone_number and await self.db.scalar(
+            select(User.id).where(User.phone_number == user_data.phone_number).limit(1)
+        ):
             raise ValueError("User already exists")
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
         user = User(
             email=user_data.email,
             phone_number=user_data.phone_number,
@@ -414,23 +601,138 @@ class UserService:
         )
         
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent registration; the unique indexes caught it
+            await self.db.rollback()
+            raise ValueError("User already exists")
         
         return user
     
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        user = self.db.query(User).filter(User.email == email).first()
-        if not user or not verify_password(password, user.hashed_password):
+        result = await self.db.execute(select(User).options(AUTH_USER_COLUMNS).where(User.email == email))
+        user = result.scalar_one_or_none()
+        if not user or not await run_in_threadpool(verify_password, password, user.hashed_password):
             return None
         
-        # Update last login
-        user.last_login = datetime.utcnow()
-        user.failed_login_attempts = 0
-        self.db.commit()
-        
+        # last_login/failed_login_attempts are persisted by record_login in the background
         return user
 
+class DiscountService:
+    """Discount queries.
+    
+    Discount responses embed their partner, so every query that returns
+    discounts loads Discount.partner with selectinload: one extra IN query
+    per result set instead of one lazy SELECT per discount. The relationship
+    is lazy="raise" so a missing eager load fails loudly instead of N+1.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def list_active_discounts(self, partner_id: Optional[uuid.UUID] = None, limit: int = 50) -> List[Discount]:
+        now = datetime.now(timezone.utc)
+        query = (
+            select(Discount)
+            .options(selectinload(Discount.partner))
+            .where(Discount.is_active, Discount.valid_from <= now, Discount.valid_until >= now)
+            .order_by(Discount.valid_until)
+            .limit(limit)
+        )
+        if partner_id is not None:
+            query = query.where(Discount.partner_id == partner_id)
+        result = await self.db.execute(query)
+        return list(result.scalars())
+    
+    @staticmethod
+    def to_response(discount: Discount) -> "DiscountResponse":
+        partner = discount.partner
+        return DiscountResponse.model_construct(
+            id=str(discount.id),
+            title=discount.title,
+            description=discount.description,
+            discount_type=discount.discount_type.value,
+            discount_value=float(discount.discount_value),
+            valid_from=discount.valid_from,
+            valid_until=discount.valid_until,
+            is_active=discount.is_active,
+            partner={
+                "id": str(partner.id),
+                "business_name": partner.business_name,
+                "business_type": partner.business_type,
+                "logo_url": partner.logo_url
+            },
+            qr_code_data=discount.qr_code_data,
+            categories=discount.categories,
+            tags=discount.tags
+        )
+
+# Logins closer together than this don't rewrite last_login
+LOGIN_RECORD_INTERVAL = timedelta(seconds=60)
+
+def login_needs_recording(user: User) -> bool:
+    if user.failed_login_attempts:
+        return True
+    return user.last_login is None or datetime.now(timezone.utc) - user.last_login >= LOGIN_RECORD_INTERVAL
+
+async def record_login(user_id: uuid.UUID) -> None:
+    """Persist a successful login using its own short-lived session"""
+    async with SessionLocal() as db:
+        await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(last_login=datetime.now(timezone.utc), failed_login_attempts=0)
+        )
+        await db.commit()
+
+# ===================== RESPONSE UTILITIES =====================
+
+_iso_cache: Tuple[int, str] = (0, "")
+
+def now_iso() -> str:
+    """Current UTC time as ISO-8601, rendered at most once per second"""
+    global _iso_cache
+    second = int(time.time())
+    if second != _iso_cache[0]:
+        _iso_cache = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+    return _iso_cache[1]
+
+class TimestampedPayload:
+    """Static JSON body whose only moving part is its "timestamp" field.
+    
+    The body is encoded at most once per second and served as raw bytes with
+    an ETag, so probes that revalidate get a bodiless 304.
+    """
+    
+    def __init__(self, payload: Dict[str, Any], cache_control: str):
+        self.payload = payload
+        self.cache_control = cache_control
+        self.timestamp = ""
+        self.body = b""
+        self.etag = ""
+    
+    def response(self, request: Request) -> Response:
+        timestamp = now_iso()
+        if timestamp != self.timestamp:
+            self.payload["timestamp"] = timestamp
+            self.body = orjson.dumps(self.payload)
+            self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+            self.timestamp = timestamp
+        
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+# Pre-encoded legacy login miss, the hot path under credential probing. Only
+# the bytes are shared: a fresh Response is built per request because
+# middleware mutates response headers in place.
+LEGACY_INVALID_CREDENTIALS_BODY = orjson.dumps({
+    "success": False,
+    "message": "Invalid credentials"
+})
+
 # ===================== FASTAPI APPLICATION =====================
 
 @asynccontextmanager
@@ -440,13 +742,34 @@ async def lifespan(app: FastAPI):
     logger.info("Starting BOOM Card Enterprise Backend")
     
     # Create database tables
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created")
     
+    # Redis client for the authenticated-user cache
+    app.state.redis = Redis.from_url(settings.redis_url)
+    
+    # Pre-rendered bodies for the static info endpoints
+    app.state.health_payload = TimestampedPayload({
+        "status": "healthy",
+        "timestamp": None,
+        "version": "1.0.0",
+        "environment": "production" if not settings.debug else "development"
+    }, cache_control="no-cache")
+    app.state.api_info_payload = TimestampedPayload({
+        "name": "BOOM Card Enterprise API",
+        "version": "1.0.0",
+        "status": "running",
+        "timestamp": None,
+        "docs_url": "/docs" if settings.debug else "Contact support for API documentation"
+    }, cache_control="public, max-age=5")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down BOOM Card Enterprise Backend")
+    await app.state.redis.aclose()
+    await engine.dispose()
 
 # Create FastAPI application
 app = FastAPI(
@@ -454,6 +777,7 @@ app = FastAPI(
     description="Production-ready digital discount card and partner management platform",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None
 )
@@ -463,11 +787,13 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
+    max_age=86400,
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Brotli for clients that accept it, gzip fallback for the rest
+app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024, gzip_fallback=True)
 
 if not settings.debug:
     app.add_middleware(
@@ -479,12 +805,12 @@ if not settings.debug:
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
             "error": exc.detail,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now_iso(),
             "path": str(request.url.path)
         }
     )
@@ -492,12 +818,12 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled error: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
             "error": "Internal server error",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now_iso(),
             "path": str(request.url.path)
         }
     )
@@ -506,35 +832,24 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 # Health check
 @app.get("/health")
-async def health_check():
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0",
-        "environment": "production" if not settings.debug else "development"
-    }
+async def health_check(request: Request):
+    return request.app.state.health_payload.response(request)
 
 # Root API info
 @app.get("/api")
-async def api_info():
-    return {
-        "name": "BOOM Card Enterprise API",
-        "version": "1.0.0", 
-        "status": "running",
-        "timestamp": datetime.utcnow().isoformat(),
-        "docs_url": "/docs" if settings.debug else "Contact support for API documentation"
-    }
+async def api_info(request: Request):
+    return request.app.state.api_info_payload.response(request)
 
 # Authentication endpoints
 @app.post("/api/v1/auth/register", response_model=UserResponse)
 async def register_user(
     user_data: UserRegistrationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     user_service = UserService(db)
     try:
         user = await user_service.create_user(user_data)
-        return UserResponse(
+        return UserResponse.model_construct(
             id=str(user.id),
             email=user.email,
             phone_number=user.phone_number,
@@ -551,7 +866,8 @@ async def register_user(
 @app.post("/api/v1/auth/login", response_model=LoginResponse)
 async def login_user(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     user_service = UserService(db)
     user = await user_service.authenticate_user(login_data.email, login_data.password)
@@ -562,10 +878,13 @@ async def login_user(
             detail="Incorrect email or password"
         )
     
+    if login_needs_recording(user):
+        background.add_task(record_login, user.id)
+    
     access_token = create_access_token(user)
     refresh_token = create_refresh_token(user)
     
-    user_response = UserResponse(
+    user_response = UserResponse.model_construct(
         id=str(user.id),
         email=user.email,
         phone_number=user.phone_number,
@@ -577,7 +896,7 @@ async def login_user(
         created_at=user.created_at
     )
     
-    return LoginResponse(
+    return LoginResponse.model_construct(
         access_token=access_token,
         refresh_token=refresh_token,
         expires_in=settings.access_token_expire_minutes * 60,
@@ -588,17 +907,18 @@ async def login_user(
 @app.post("/api/auth/login")
 async def legacy_login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     """Legacy login endpoint for backward compatibility"""
     user_service = UserService(db)
     user = await user_service.authenticate_user(login_data.email, login_data.password)
     
     if not user:
-        return {
-            "success": False,
-            "message": "Invalid credentials"
-        }
+        return Response(content=LEGACY_INVALID_CREDENTIALS_BODY, media_type="application/json")
+    
+    if login_needs_recording(user):
+        background.add_task(record_login, user.id)
     
     access_token = create_access_token(user)
     
@@ -612,7 +932,7 @@ async def legacy_login(
                 "email": user.email,
                 "firstName": user.first_name,
                 "lastName": user.last_name,
-                "membershipType": user.subscription_type.value.title()
+                "membershipType": MEMBERSHIP_LABELS[user.subscription_type]
             }
         }
     }
@@ -620,7 +940,7 @@ async def legacy_login(
 @app.post("/api/auth/register")
 async def legacy_register(
     user_data: UserRegistrationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Legacy register endpoint for backward compatibility"""
     user_service = UserService(db)
@@ -645,54 +965,73 @@ async def legacy_register(
         }
 
 # User profile endpoints
+# These return ORJSONResponse directly: the payloads are plain dicts of
+# JSON-native values, so FastAPI's jsonable_encoder pass adds nothing.
 @app.get("/api/auth/profile")
-async def get_user_profile(current_user: User = Depends(get_current_user)):
-    return {
+async def get_user_profile(current_user: CurrentUser = Depends(get_current_user)):
+    return ORJSONResponse({
         "success": True,
         "data": {
             "id": str(current_user.id),
             "email": current_user.email,
             "firstName": current_user.first_name,
             "lastName": current_user.last_name,
-            "membershipType": current_user.subscription_type.value.title(),
+            "membershipType": MEMBERSHIP_LABELS[current_user.subscription_type],
             "emailVerified": current_user.email_verified,
             "joinDate": current_user.created_at.strftime("%Y-%m-%d"),
             "validUntil": "2025-12-31"  # Mock data for now
         }
-    }
+    })
 
 # Mock endpoints for frontend compatibility
 @app.get("/api/users/achievements")
-async def get_user_achievements(current_user: User = Depends(get_current_user)):
-    return {
+async def get_user_achievements(current_user: CurrentUser = Depends(get_current_user)):
+    return ORJSONResponse({
         "success": True,
         "data": [
             {"id": 1, "title": "Welcome!", "description": "Joined BOOM Card", "icon": "🎉", "date": current_user.created_at.strftime("%Y-%m-%d")},
-            {"id": 2, "title": "First Login", "description": "Successfully logged in", "icon": "🔑", "date": datetime.utcnow().strftime("%Y-%m-%d")}
+            {"id": 2, "title": "First Login", "description": "Successfully logged in", "icon": "🔑", "date": datetime.now(timezone.utc).strftime("%Y-%m-%d")}
         ]
-    }
+    })
 
 @app.get("/api/users/stats")
-async def get_user_stats(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Calculate real stats from database
-    total_transactions = db.query(Transaction).filter(Transaction.user_id == current_user.id).count()
-    total_savings = db.query(func.sum(Transaction.discount_amount)).filter(Transaction.user_id == current_user.id).scalar() or 0
+async def get_user_stats(current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    # Calculate real stats from database in a single round trip
+    favorites_count = (
+        select(func.count(UserFavorite.id))
+        .where(UserFavorite.user_id == current_user.id)
+        .scalar_subquery()
+    )
+    stats_query = select(
+        func.count(Transaction.id),
+        func.coalesce(func.sum(Transaction.discount_amount), 0),
+        favorites_count
+    ).where(Transaction.user_id == current_user.id)
+    result = await db.execute(stats_query)
+    total_transactions, total_savings, favorite_partners = result.one()
     
     return {
         "success": True,
         "data": {
             "totalSavings": float(total_savings),
             "totalPurchases": total_transactions,
-            "favoritePartners": db.query(UserFavorite).filter(UserFavorite.user_id == current_user.id).count(),
+            "favoritePartners": favorite_partners,
             "memberSince": current_user.created_at.strftime("%Y-%m-%d")
         }
     }
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "boom_card_enterprise:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", "5002")),
-        reload=settings.debug
+        reload=settings.debug,
+        # uvloop has no Windows build; httptools is the C HTTP parser
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        access_log=settings.debug,
+        timeout_keep_alive=75,
+        backlog=2048
     )
\ No newline at end of file
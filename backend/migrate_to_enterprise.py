@@ -10,8 +10,14 @@ import os
 import json
 import shutil
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # migration runs before requirements_enterprise.txt is installed
+    orjson = None
+
 def create_backup():
     """Create backup of current configuration"""
     print("📦 Creating backup of current configuration...")
@@ -25,10 +31,23 @@ def create_backup():
         ".env.production"
     ]
     
+    pairs = []
     for file in files_to_backup:
         source = Path(__file__).parent / file
         if source.exists():
-            shutil.copy2(source, backup_dir / file)
+            pairs.append((file, source, backup_dir / file))
+    
+    # Copies are I/O-bound, so threads overlap them without GIL contention.
+    # Content is all a config backup needs; copyfile skips copy2's metadata
+    # syscalls and takes the sendfile fast path on Linux.
+    if pairs:
+        with ThreadPoolExecutor(max_workers=len(pairs)) as executor:
+            futures = [
+                (file, executor.submit(shutil.copyfile, source, target))
+                for file, source, target in pairs
+            ]
+        for file, future in futures:
+            future.result()
             print(f"   ✅ Backed up {file}")
     
     print(f"   📁 Backup created at: {backup_dir}")
@@ -44,8 +63,9 @@ def update_package_json():
         print("   ⚠️  package.json not found, creating new one")
         package_data = {}
     else:
-        with open(package_file, 'r') as f:
-            package_data = json.load(f)
+        with open(package_file, 'rb') as f:
+            raw = f.read()
+        package_data = orjson.loads(raw) if orjson else json.loads(raw)
     
     # Update scripts
     package_data.setdefault("scripts", {})
@@ -70,8 +90,12 @@ def update_package_json():
         }
     })
     
-    with open(package_file, 'w') as f:
-        json.dump(package_data, f, indent=2)
+    if orjson:
+        with open(package_file, 'wb') as f:
+            f.write(orjson.dumps(package_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(package_file, 'w') as f:
+            json.dump(package_data, f, indent=2)
     
     print("   ✅ package.json updated")
 
@@ -91,7 +115,11 @@ def update_env_production():
         "",
         "# Database connection pooling",
         "DB_POOL_SIZE=10",
-        "DB_MAX_OVERFLOW=20",
+        "DB_MAX_OVERFLOW=5",
+        "DB_POOL_RECYCLE=1800",
+        "DB_POOL_TIMEOUT=10",
+        "# Set to true when DATABASE_URL points at a PgBouncer transaction pooler",
+        "DB_USE_PGBOUNCER=false",
         "",
         "# Rate limiting",
         "RATE_LIMIT_REQUESTS_PER_MINUTE=100",
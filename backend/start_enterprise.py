@@ -12,6 +12,7 @@ Usage:
 import os
 import sys
 import argparse
+import hashlib
 import subprocess
 from pathlib import Path
 
@@ -20,11 +21,22 @@ def install_requirements():
     print("📦 Installing enterprise backend requirements...")
     
     requirements_file = Path(__file__).parent / "requirements_enterprise.txt"
+    manifest_file = Path(__file__).parent / ".requirements_enterprise.sha256"
+    
+    # Key the manifest on the interpreter too, so a new venv still installs
+    digest = hashlib.sha256(requirements_file.read_bytes())
+    digest.update(sys.executable.encode())
+    fingerprint = digest.hexdigest()
+    
+    if manifest_file.exists() and manifest_file.read_text().strip() == fingerprint:
+        print("✅ Requirements unchanged since last install, skipping")
+        return True
     
     try:
         subprocess.check_call([
             sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
         ])
+        manifest_file.write_text(fingerprint)
         print("✅ Requirements installed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -64,6 +76,11 @@ def start_server(debug=False, port=5002):
     if debug:
         os.environ["DEBUG"] = "true"
     
+    # C event loop and HTTP parser (both ship with uvicorn[standard]);
+    # uvloop has no Windows build, so fall back to asyncio there.
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    server_flags = ["--loop", loop, "--http", "httptools"]
+    
     try:
         if debug:
             # Development mode with auto-reload
@@ -73,7 +90,8 @@ def start_server(debug=False, port=5002):
                 "--host", "0.0.0.0",
                 "--port", str(port),
                 "--reload",
-                "--log-level", "debug"
+                "--log-level", "debug",
+                *server_flags
             ])
         else:
             # Production mode
@@ -83,7 +101,12 @@ def start_server(debug=False, port=5002):
                 "--host", "0.0.0.0",
                 "--port", str(port),
                 "--workers", "4",
-                "--access-log"
+                "--access-log",
+                # Outlive the proxy's idle keep-alive (nginx default 60s) so
+                # the server never closes a connection the proxy is reusing
+                "--timeout-keep-alive", "75",
+                "--backlog", "2048",
+                *server_flags
             ])
     except KeyboardInterrupt:
         print("\n👋 Shutting down BOOM Card Enterprise Backend")
@@ -3,82 +3,105 @@
 Cleanup script to remove markdown code fences from source files
 """
 import os
-import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Source file extensions to clean (a tuple so str.endswith checks them in C)
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+
+# Directories the walk never descends into
+SKIP_DIRS = frozenset({'node_modules', '.next', 'dist', '.git'})
+
 def clean_file(filepath):
-    """Remove markdown code fences from the beginning and end of a file"""
+    """Remove markdown code fences from the beginning and end of a file
+
+    Returns True if the file was cleaned, False if it had no fence and None
+    if it starts with a fence but could not be cleaned.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Work on bytes: most files have no fence, so skip the UTF-8 decode
+        with open(filepath, 'rb') as f:
+            data = f.read()
         
         # Check if file starts with a code fence
-        if content.startswith('```'):
-            # Find the end of the first line (the fence line)
-            first_newline = content.find('\n')
-            if first_newline != -1:
-                # Remove the opening fence line
-                content = content[first_newline + 1:]
-                
-                # Remove closing fence if present
-                if content.rstrip().endswith('```'):
-                    last_fence_index = content.rstrip().rfind('```')
-                    content = content[:last_fence_index].rstrip() + '\n'
-                
-                # Write cleaned content back
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
-                return True
+        if not data.startswith(b'```'):
+            return False
+        
+        # Find the end of the first line (the fence line)
+        first_newline = data.find(b'\n')
+        if first_newline == -1:
+            return None
+        
+        # Remove the opening fence line, then the closing fence if present
+        body = data[first_newline + 1:]
+        stripped = body.rstrip()
+        if stripped.endswith(b'```'):
+            # Bytes keep CRLF endings, so end with the file's own terminator
+            newline = b'\r\n' if data[first_newline - 1:first_newline] == b'\r' else b'\n'
+            body = stripped[:-3].rstrip() + newline
+        
+        # Write cleaned content back
+        with open(filepath, 'wb') as f:
+            f.write(body)
+        
+        return True
     except Exception as e:
         print(f"Error processing {filepath}: {e}")
-        return False
+        return None
+
+def collect_source_files():
+    """Walk the project and return source files that may need cleaning"""
+    paths = []
     
-    return False
+    for root, dirs, files in os.walk('.'):
+        # Prune node_modules and other build directories so the walk
+        # never descends into them
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        
+        for file in files:
+            if file.endswith(SOURCE_EXTENSIONS):
+                paths.append(os.path.join(root, file))
+    
+    return paths
 
 def cleanup_project():
     """Clean all TypeScript, JavaScript, and other source files"""
-    cleaned_count = 0
-    error_count = 0
+    paths = collect_source_files()
     
-    extensions = ['.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs']
+    # Files are independent, so clean them across all cores
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(clean_file, paths, chunksize=64))
     
-    for root, dirs, files in os.walk('.'):
-        # Skip node_modules and other build directories
-        if 'node_modules' in root or '.next' in root or 'dist' in root:
-            continue
-            
-        for file in files:
-            if any(file.endswith(ext) for ext in extensions):
-                filepath = os.path.join(root, file)
-                if clean_file(filepath):
-                    cleaned_count += 1
-                    print(f"✓ Cleaned: {filepath}")
-                else:
-                    # Check if it actually needed cleaning
-                    try:
-                        with open(filepath, 'r') as f:
-                            if f.read().startswith('```'):
-                                error_count += 1
-                                print(f"✗ Failed to clean: {filepath}")
-                    except:
-                        pass
+    # Emit per-file status as one block rather than a write per file
+    lines = []
+    for filepath, result in zip(paths, results):
+        if result:
+            lines.append(f"✓ Cleaned: {filepath}")
+        elif result is None:
+            lines.append(f"✗ Failed to clean: {filepath}")
+    cleaned_count = results.count(True)
+    error_count = results.count(None)
     
-    print(f"\n🧹 Cleanup Summary:")
-    print(f"   Files cleaned: {cleaned_count}")
-    print(f"   Errors: {error_count}")
-    print(f"   Total processed: {cleaned_count + error_count}")
+    lines.append(f"\n🧹 Cleanup Summary:")
+    lines.append(f"   Files cleaned: {cleaned_count}")
+    lines.append(f"   Errors: {error_count}")
+    lines.append(f"   Total processed: {cleaned_count + error_count}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Create a cleanup report
+    report = (
+        f"# BOOM Card Project Cleanup Report\n\n"
+        f"## Summary\n"
+        f"- Files cleaned: {cleaned_count}\n"
+        f"- Errors encountered: {error_count}\n"
+        f"- Cleanup performed on: {Path.cwd()}\n\n"
+        f"## Action Taken\n"
+        f"Removed markdown code fences from source files that were incorrectly "
+        f"included during AI generation.\n"
+    )
     with open('CLEANUP_REPORT.md', 'w') as f:
-        f.write(f"# BOOM Card Project Cleanup Report\n\n")
-        f.write(f"## Summary\n")
-        f.write(f"- Files cleaned: {cleaned_count}\n")
-        f.write(f"- Errors encountered: {error_count}\n")
-        f.write(f"- Cleanup performed on: {Path.cwd()}\n\n")
-        f.write(f"## Action Taken\n")
-        f.write(f"Removed markdown code fences from source files that were incorrectly ")
-        f.write(f"included during AI generation.\n")
+        f.write(report)
 
 if __name__ == "__main__":
     print("🚀 Starting BOOM Card project cleanup...")
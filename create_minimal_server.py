@@ -32,19 +32,25 @@ app.use(cors({
 app.use(express.json({ limit: '10mb' }));
 app.use(express.urlencoded({ extended: true, limit: '10mb' }));
 
-// Request ID middleware
+// Request ID middleware: per-process prefix + counter, unique across
+// restarts and workers without a clock read or RNG call per request
+const requestIdPrefix = `req_${Date.now().toString(36)}_${process.pid.toString(36)}_`;
+let requestCounter = 0;
 app.use((req: Request, res: Response, next: NextFunction) => {
-  const requestId = `req_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+  const requestId = requestIdPrefix + (requestCounter++).toString(36);
   (req as CustomRequest).requestId = requestId;
   res.setHeader('X-Request-ID', requestId);
   next();
 });
 
-// Basic logging middleware
-app.use((req: Request, res: Response, next: NextFunction) => {
-  console.log(`${new Date().toISOString()} - ${req.method} ${req.path}`);
-  next();
-});
+// Basic logging middleware (console.log writes synchronously, so keep it
+// off the production hot path)
+if (process.env.NODE_ENV !== 'production') {
+  app.use((req: Request, res: Response, next: NextFunction) => {
+    console.log(`${new Date().toISOString()} - ${req.method} ${req.path}`);
+    next();
+  });
+}
 
 // Basic routes
 app.get('/api/health', (req: Request, res: Response) => {
@@ -8,8 +8,13 @@ from airflow.utils.task_group import TaskGroup
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional
-import json
+import atexit
 import logging
+import os
+import orjson
+import uuid
+from contextlib import contextmanager
+from psycopg2.pool import ThreadedConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +29,10 @@ default_args = {
     'retries': 2,
     'retry_delay': timedelta(minutes=5),
     'execution_timeout': timedelta(hours=2),
+    # Every task here runs heavy aggregates against boom_postgres; the pool
+    # caps how many run at once across all DAGs. Create it before enabling:
+    #   airflow pools set postgres_heavy 4 "Heavy analytics queries"
+    'pool': 'postgres_heavy',
 }
 
 # DAG definition
@@ -33,21 +42,71 @@ dag = DAG(
     description='Analytics pipeline for BOOM Card platform metrics and insights',
     schedule_interval='0 2 * * *',  # Daily at 2 AM
     catchup=False,
+    max_active_tasks=8,
     tags=['analytics', 'reporting', 'kpi'],
 )
 
+# Created on first use rather than at import, since the scheduler parses
+# this file constantly; tracked per process so forked workers never share
+# a parent's sockets
+_postgres_pool: Optional[ThreadedConnectionPool] = None
+_postgres_pool_pid: Optional[int] = None
+
+def _get_postgres_pool() -> ThreadedConnectionPool:
+    """Get this process's PostgreSQL connection pool"""
+    global _postgres_pool, _postgres_pool_pid
+    if _postgres_pool is None or _postgres_pool_pid != os.getpid():
+        _postgres_pool = ThreadedConnectionPool(
+            1,
+            8,
+            dsn=PostgresHook(postgres_conn_id='boom_postgres').get_uri()
+        )
+        _postgres_pool_pid = os.getpid()
+    return _postgres_pool
+
+def _close_postgres_pool():
+    if _postgres_pool is not None and _postgres_pool_pid == os.getpid():
+        _postgres_pool.closeall()
+
+atexit.register(_close_postgres_pool)
+
+@contextmanager
 def get_postgres_connection():
-    """Get PostgreSQL connection"""
-    return PostgresHook(postgres_conn_id='boom_postgres').get_conn()
+    """Borrow a pooled PostgreSQL connection for the duration of a block"""
+    pool = _get_postgres_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        # putconn rolls back any open transaction before reuse
+        pool.putconn(conn)
 
 def get_redis_connection():
     """Get Redis connection"""
     return RedisHook(redis_conn_id='boom_redis').get_conn()
 
+def read_sql_chunked(conn, query: str, params: tuple, chunksize: int = 50_000) -> pd.DataFrame:
+    """Stream a query through a server-side cursor into a DataFrame"""
+    # Unlike pd.read_sql, a named cursor has Postgres send rows in batches,
+    # so the full result is never buffered client-side as Python tuples
+    frames = []
+    with conn.cursor(name=f"analytics_{uuid.uuid4().hex}") as cursor:
+        cursor.itersize = chunksize
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                break
+            columns = [col[0] for col in cursor.description]
+            frames.append(pd.DataFrame.from_records(rows, columns=columns, coerce_float=True))
+    
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
 def calculate_transaction_metrics(**context):
     """Calculate transaction-based metrics"""
     try:
-        conn = get_postgres_connection()
         execution_date = context['execution_date']
         
         # Transaction volume metrics
@@ -69,11 +128,12 @@ def calculate_transaction_metrics(**context):
         GROUP BY DATE_TRUNC('day', created_at), partner_id, user_id
         """
         
-        df = pd.read_sql(
-            query, 
-            conn, 
-            params=(execution_date - timedelta(days=1), execution_date)
-        )
+        with get_postgres_connection() as conn:
+            df = read_sql_chunked(
+                conn,
+                query,
+                params=(execution_date - timedelta(days=1), execution_date)
+            )
         
         # Calculate additional metrics
         if not df.empty:
@@ -88,13 +148,17 @@ def calculate_transaction_metrics(**context):
                 'date': execution_date.strftime('%Y-%m-%d')
             }
             
-            # Store in Redis for real-time access
-            redis = get_redis_connection()
-            redis.setex(
-                f"analytics:daily:transactions:{execution_date.strftime('%Y%m%d')}",
-                86400 * 7,  # 7 days TTL
-                json.dumps(metrics)
-            )
+            # Store in Redis for real-time access as a hash, so readers can
+            # HGET single fields without parsing a JSON blob. DEL, HSET and
+            # the TTL go out together in one MULTI/EXEC, so a rerun replaces
+            # the key atomically (including an older string value, which
+            # would make HSET fail with WRONGTYPE) instead of merging into it
+            key = f"analytics:daily:transactions:{execution_date.strftime('%Y%m%d')}"
+            pipe = get_redis_connection().pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=metrics)
+            pipe.expire(key, 86400 * 7)  # 7 days TTL
+            pipe.execute()
             
             return metrics
         
@@ -103,14 +167,10 @@ def calculate_transaction_metrics(**context):
     except Exception as e:
         logger.error(f"Error calculating transaction metrics: {str(e)}")
         raise
-    finally:
-        if conn:
-            conn.close()
 
 def calculate_partner_performance(**context):
     """Calculate partner performance metrics"""
     try:
-        conn = get_postgres_connection()
         execution_date = context['execution_date']
         
         query = """
@@ -149,32 +209,36 @@ def calculate_partner_performance(**context):
         ORDER BY net_revenue DESC
         """
         
-        df = pd.read_sql(
-            query,
-            conn,
-            params=(execution_date - timedelta(days=30), execution_date)
-        )
+        with get_postgres_connection() as conn:
+            df = read_sql_chunked(
+                conn,
+                query,
+                params=(execution_date - timedelta(days=30), execution_date)
+            )
         
         if not df.empty:
-            # Store partner rankings
-            redis = get_redis_connection()
+            # Store partner rankings in one round trip; the keys are
+            # independent, so no MULTI/EXEC is needed
+            pipe = get_redis_connection().pipeline(transaction=False)
             
-            # Top performing partners by category
-            for category in df['category'].unique():
-                category_df = df[df['category'] == category].head(20)
-                redis.setex(
+            # Top performing partners by category: rows already come back
+            # ordered by net_revenue, so one groupby pass takes each top 20
+            top_by_category = df.groupby('category', sort=False).head(20)
+            for category, category_df in top_by_category.groupby('category', sort=False):
+                pipe.setex(
                     f"analytics:partners:top:{category}:{execution_date.strftime('%Y%m%d')}",
                     86400 * 7,
-                    category_df.to_json(orient='records')
+                    orjson.dumps(category_df.to_dict('records'), option=orjson.OPT_SERIALIZE_NUMPY)
                 )
             
             # Overall top partners
             top_partners = df.head(50).to_dict('records')
-            redis.setex(
+            pipe.setex(
                 f"analytics:partners:top:overall:{execution_date.strftime('%Y%m%d')}",
                 86400 * 7,
-                json.dumps(top_partners)
+                orjson.dumps(top_partners, option=orjson.OPT_SERIALIZE_NUMPY)
             )
+            pipe.execute()
             
             return {'processed_partners': len(df)}
         
@@ -183,55 +247,51 @@ def calculate_partner_performance(**context):
     except Exception as e:
         logger.error(f"Error calculating partner performance: {str(e)}")
         raise
-    finally:
-        if conn:
-            conn.close()
 
 def calculate_user_behavior(**context):
     """Analyze user behavior patterns"""
     try:
-        conn = get_postgres_connection()
         execution_date = context['execution_date']
         
-        # User engagement metrics
+        # Per-user engagement metrics; the per-subscription rollup is done
+        # below so Postgres doesn't have to sort every user for the medians
         query = """
-        WITH user_metrics AS (
-            SELECT 
-                u.id as user_id,
-                u.subscription_type,
-                u.created_at as user_created_at,
-                COUNT(DISTINCT t.id) as transaction_count,
-                COUNT(DISTINCT t.partner_id) as unique_partners_visited,
-                COUNT(DISTINCT t.partner_category) as unique_categories_visited,
-                SUM(t.discount_amount) as total_savings,
-                AVG(t.discount_percentage) as avg_discount_used,
-                MAX(t.created_at) as last_transaction_date,
-                MIN(t.created_at) as first_transaction_date
-            FROM users u
-            LEFT JOIN transactions t ON u.id = t.user_id
-            WHERE t.created_at >= %s AND t.created_at < %s
-                AND t.status = 'completed'
-            GROUP BY u.id, u.subscription_type, u.created_at
-        )
         SELECT 
-            subscription_type,
-            COUNT(DISTINCT user_id) as active_users,
-            AVG(transaction_count) as avg_transactions_per_user,
-            AVG(unique_partners_visited) as avg_partners_per_user,
-            AVG(unique_categories_visited) as avg_categories_per_user,
-            AVG(total_savings) as avg_savings_per_user,
-            AVG(avg_discount_used) as avg_discount_rate,
-            PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY transaction_count) as median_transactions,
-            PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY total_savings) as median_savings
-        FROM user_metrics
-        GROUP BY subscription_type
+            u.id as user_id,
+            u.subscription_type,
+            COUNT(DISTINCT t.id) as transaction_count,
+            COUNT(DISTINCT t.partner_id) as unique_partners_visited,
+            COUNT(DISTINCT t.partner_category) as unique_categories_visited,
+            SUM(t.discount_amount) as total_savings,
+            AVG(t.discount_percentage) as avg_discount_used
+        FROM users u
+        LEFT JOIN transactions t ON u.id = t.user_id
+        WHERE t.created_at >= %s AND t.created_at < %s
+            AND t.status = 'completed'
+        GROUP BY u.id, u.subscription_type
         """
         
-        df = pd.read_sql(
-            query,
-            conn,
-            params=(execution_date - timedelta(days=30), execution_date)
-        )
+        with get_postgres_connection() as conn:
+            user_metrics = read_sql_chunked(
+                conn,
+                query,
+                params=(execution_date - timedelta(days=30), execution_date)
+            )
+        
+        # Engagement by subscription type; pandas medians are selection
+        # based rather than the full sort PERCENTILE_CONT does
+        df = pd.DataFrame()
+        if not user_metrics.empty:
+            df = user_metrics.groupby('subscription_type', dropna=False).agg(
+                active_users=('user_id', 'nunique'),
+                avg_transactions_per_user=('transaction_count', 'mean'),
+                avg_partners_per_user=('unique_partners_visited', 'mean'),
+                avg_categories_per_user=('unique_categories_visited', 'mean'),
+                avg_savings_per_user=('total_savings', 'mean'),
+                avg_discount_rate=('avg_discount_used', 'mean'),
+                median_transactions=('transaction_count', 'median'),
+                median_savings=('total_savings', 'median'),
+            ).reset_index()
         
         # User retention cohorts
         retention_query = """
@@ -254,11 +314,12 @@ def calculate_user_behavior(**context):
         ORDER BY cohort_month, transaction_month
         """
         
-        retention_df = pd.read_sql(
-            retention_query,
-            conn,
-            params=(execution_date - timedelta(days=365),)
-        )
+        with get_postgres_connection() as conn:
+            retention_df = read_sql_chunked(
+                conn,
+                retention_query,
+                params=(execution_date - timedelta(days=365),)
+            )
         
         # Calculate retention rates
         if not retention_df.empty:
@@ -268,9 +329,10 @@ def calculate_user_behavior(**context):
                 values='active_users'
             )
             
-            # Calculate retention percentages
-            for col in retention_pivot.columns:
-                retention_pivot[col] = retention_pivot[col] / retention_pivot.iloc[:, 0] * 100
+            # Calculate retention percentages against each cohort's first
+            # active month (the pivot's first column is only the oldest cohort's)
+            cohort_size = retention_pivot.bfill(axis=1).iloc[:, 0].replace(0, np.nan)
+            retention_pivot = retention_pivot.div(cohort_size, axis=0).mul(100).fillna(0)
             
             # Store retention data
           
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Redis-backed XCom for the BOOM Card analytics DAGs
+
+DataFrames pushed to XCom are written to Redis as Arrow IPC streams and only a
+reference string is stored in the Airflow metadata DB, so large partner and
+retention frames never land in the scheduler's Postgres. Everything else goes
+through the default XCom serialization.
+
+Enable with:
+    AIRFLOW__CORE__XCOM_BACKEND=redis_xcom_backend.RedisXComBackend
+and an Airflow connection `xcom_cache` pointing at the Redis instance.
+"""
+
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+from airflow.models.xcom import BaseXCom
+from airflow.providers.redis.hooks.redis import RedisHook
+
+XCOM_REDIS_CONN_ID = 'xcom_cache'
+XCOM_REDIS_PREFIX = 'xcom_redis://'
+XCOM_REDIS_TTL = 86400 * 7  # matches the analytics keys' 7 day TTL
+
+
+def get_xcom_redis():
+    """Get Redis connection for XCom payloads"""
+    return RedisHook(redis_conn_id=XCOM_REDIS_CONN_ID).get_conn()
+
+
+class RedisXComBackend(BaseXCom):
+    """XCom backend that offloads DataFrames to Redis as Arrow IPC bytes"""
+
+    @staticmethod
+    def serialize_value(
+        value: Any,
+        *,
+        key: str = None,
+        task_id: str = None,
+        dag_id: str = None,
+        run_id: str = None,
+        map_index: int = None,
+        **kwargs
+    ):
+        if isinstance(value, pd.DataFrame):
+            redis_key = f"xcom:{dag_id}:{run_id}:{task_id}:{map_index}:{key}"
+
+            table = pa.Table.from_pandas(value)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+
+            get_xcom_redis().setex(redis_key, XCOM_REDIS_TTL, sink.getvalue().to_pybytes())
+            value = XCOM_REDIS_PREFIX + redis_key
+
+        return BaseXCom.serialize_value(value)
+
+    @staticmethod
+    def deserialize_value(result) -> Any:
+        value = BaseXCom.deserialize_value(result)
+
+        if isinstance(value, str) and value.startswith(XCOM_REDIS_PREFIX):
+            payload = get_xcom_redis().get(value[len(XCOM_REDIS_PREFIX):])
+            if payload is None:
+                raise KeyError(f"XCom payload expired or missing in Redis: {value}")
+            value = pa.ipc.open_stream(payload).read_all().to_pandas()
+
+        return value
+
+    def orm_deserialize_value(self) -> Any:
+        # The UI only needs the reference, not the frame itself
+        return BaseXCom.deserialize_value(self)
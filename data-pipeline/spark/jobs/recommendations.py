@@ -10,15 +10,20 @@ import sys
 import os
 import json
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional, Any
 import numpy as np
+import pyarrow as pa
+from pyspark import StorageLevel
 from pyspark.sql import SparkSession, DataFrame, Window
 from pyspark.sql import functions as F
 from pyspark.sql.types import (
     StructType, StructField, StringType, IntegerType, 
     FloatType, ArrayType, TimestampType, BooleanType
 )
+from pyspark.ml import Pipeline, PipelineModel
 from pyspark.ml.feature import VectorAssembler, StandardScaler
 from pyspark.ml.recommendation import ALS
 from pyspark.ml.evaluation import RegressionEvaluator
@@ -27,6 +32,7 @@ from pyspark.ml.linalg import Vectors
 import redis
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 
 # Configure logging
 logging.basicConfig(
@@ -35,21 +41,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows per fetchmany() round trip when streaming query results
+FETCH_CHUNK_SIZE = 50_000
+
+def create_spark_session(app_name: str = 'BOOMCardRecommendations') -> SparkSession:
+    """Create the Spark session for the recommendation job"""
+    # Kryo is much more compact and faster than Java serialization for the
+    # shuffled ALS blocks; must be set before the context starts.
+    # Partner and trending lookups stay well under 128 MB, so joins against
+    # them are hash-broadcast instead of shuffling the interactions side
+    return (
+        SparkSession.builder
+        .appName(app_name)
+        .config('spark.serializer', 'org.apache.spark.serializer.KryoSerializer')
+        .config('spark.kryo.registrationRequired', 'false')
+        .config('spark.sql.execution.arrow.pyspark.enabled', 'true')
+        .config('spark.sql.autoBroadcastJoinThreshold', str(128 * 1024 * 1024))
+        .getOrCreate()
+    )
+
 class RecommendationEngine:
     """Main recommendation engine for BOOM Card platform"""
     
     def __init__(self, spark: SparkSession, config: Dict[str, Any]):
         self.spark = spark
         self.config = config
+        self.spark.conf.set('spark.sql.execution.arrow.pyspark.enabled', 'true')
         self.redis_client = self._init_redis()
-        self.db_conn = self._init_postgres()
+        self.db_pool = self._init_postgres()
         
         # ML model parameters
         self.als_rank = config.get('als_rank', 50)
         self.als_iterations = config.get('als_iterations', 10)
         self.als_reg_param = config.get('als_reg_param', 0.01)
+        self.als_implicit_prefs = config.get('als_implicit_prefs', True)
+        self.als_alpha = config.get('als_alpha', 40.0)
+        self.als_num_blocks = config.get('als_num_blocks', spark.sparkContext.defaultParallelism)
         self.kmeans_k = config.get('kmeans_clusters', 10)
         
+        # ALS checkpoints every few iterations to cut the lineage; Spark
+        # ignores checkpointInterval unless a checkpoint dir is set
+        if config.get('checkpoint_dir'):
+            spark.sparkContext.setCheckpointDir(config['checkpoint_dir'])
+        
         # Recommendation parameters
         self.num_recommendations = config.get('num_recommendations', 20)
         self.min_interactions = config.get('min_interactions', 5)
@@ -70,9 +104,12 @@ class RecommendationEngine:
             }
         )
     
-    def _init_postgres(self) -> psycopg2.extensions.connection:
-        """Initialize PostgreSQL connection"""
-        return psycopg2.connect(
+    def _init_postgres(self) -> ThreadedConnectionPool:
+        """Initialize PostgreSQL connection pool"""
+        # Up to one connection per load_data lookup query running concurrently
+        return ThreadedConnectionPool(
+            1,
+            4,
             host=self.config['postgres_host'],
             port=self.config['postgres_port'],
             database=self.config['postgres_db'],
@@ -180,28 +217,118 @@ class RecommendationEngine:
             HAVING COUNT(DISTINCT r.user_id) > 0 OR COUNT(DISTINCT v.user_id) > 0
         """
         
+        # Interactions are by far the largest result: executors read them
+        # straight from Postgres in parallel shards instead of via the driver
+        interactions_df = self._jdbc_query_to_df(interactions_query, 'user_id')
+        
+        # The small lookup queries are independent, so run them concurrently
+        # on their own pooled connections; wall time becomes the slowest query
+        queries = [partners_query, users_query, trending_query]
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            tables = list(executor.map(self._fetch_table, queries))
+        
         # Convert to Spark DataFrames
-        interactions_df = self._query_to_df(interactions_query)
-        partners_df = self._query_to_df(partners_query)
-        users_df = self._query_to_df(users_query)
-        trending_df = self._query_to_df(trending_query)
+        partners_df, users_df, trending_df = (
+            self._table_to_df(table) for table in tables
+        )
+        
+        # Partners and trending are bounded by the active partner count and
+        # get joined onto interactions; cache them so each broadcast is built
+        # from memory once rather than recomputed per join
+        partners_df = F.broadcast(partners_df.cache())
+        trending_df = F.broadcast(trending_df.cache())
         
         return interactions_df, partners_df, users_df, trending_df
     
+    def _jdbc_query_to_df(self, query: str, partition_column: str) -> DataFrame:
+        """Read a query through Spark's JDBC source, sharded across executors
+        
+        The ids are UUIDs, so instead of a numeric partitionColumn range each
+        shard gets a hash-mod predicate on partition_column. Needs the
+        PostgreSQL JDBC driver on the Spark classpath.
+        """
+        num_partitions = self.config.get('jdbc_num_partitions', 16)
+        predicates = [
+            f"(hashtext({partition_column}::text) & 2147483647) % {num_partitions} = {shard}"
+            for shard in range(num_partitions)
+        ]
+        
+        return self.spark.read.jdbc(
+            url=(
+                f"jdbc:postgresql://{self.config['postgres_host']}:"
+                f"{self.config['postgres_port']}/{self.config['postgres_db']}"
+            ),
+            table=f"({query}) AS src",
+            predicates=predicates,
+            properties={
+                'user': self.config['postgres_user'],
+                'password': self.config['postgres_password'],
+                'driver': 'org.postgresql.Driver',
+                'fetchsize': str(self.config.get('jdbc_fetch_size', 10000)),
+            }
+        )
+    
     def _query_to_df(self, query: str) -> DataFrame:
         """Execute query and convert to Spark DataFrame"""
-        with self.db_conn.cursor() as cursor:
-            cursor.execute(query)
-            rows = cursor.fetchall()
+        return self._table_to_df(self._fetch_table(query))
+    
+    def _fetch_table(self, query: str) -> Optional[pa.Table]:
+        """Execute query on a pooled connection and collect it as an Arrow table"""
+        batches = []
+        conn = self.db_pool.getconn()
+        try:
+            # Named (server-side) cursor so Postgres streams the result;
+            # each chunk goes straight into a columnar batch, so at most one
+            # chunk of Python rows is alive at a time
+            with conn.cursor(name=f"rec_{uuid.uuid4().hex}") as cursor:
+                cursor.execute(query)
+                while True:
+                    rows = cursor.fetchmany(FETCH_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    batches.append(pa.Table.from_batches([pa.RecordBatch.from_pylist(rows)]))
+        finally:
+            self.db_pool.putconn(conn)
             
-        if not rows:
-            return self.spark.createDataFrame([], StructType([]))
+        if not batches:
+            return None
             
-        # Convert to Spark DataFrame
-        columns = list(rows[0].keys())
-        data = [list(row.values()) for row in rows]
+        # Types are inferred per chunk (an all-NULL chunk, a wider NUMERIC),
+        # so unify the schemas while stitching the chunks together
+        return pa.concat_tables(batches, promote_options='permissive')
+    
+    def _table_to_df(self, table: Optional[pa.Table]) -> DataFrame:
+        """Convert a fetched Arrow table to a Spark DataFrame"""
+        if table is None:
+            return self.spark.createDataFrame([], StructType([]))
         
-        return self.spark.createDataFrame(data, columns)
+        return self.spark.createDataFrame(table.to_pandas(self_destruct=True))
+    
+    def _build_als(self) -> ALS:
+        """Build the ALS estimator for the interaction ratings
+        
+        Ratings come from implicit signals (redemptions, favorites, views), so
+        the implicit-feedback solver is used with the rating as confidence.
+        ALS needs integer ids, so it reads user_index/partner_index rather
+        than the UUID columns.
+        """
+        return ALS(
+            userCol='user_index',
+            itemCol='partner_index',
+            ratingCol='weighted_rating',
+            rank=self.als_rank,
+            maxIter=self.als_iterations,
+            regParam=self.als_reg_param,
+            implicitPrefs=self.als_implicit_prefs,
+            alpha=self.als_alpha,
+            nonnegative=True,
+            coldStartStrategy='drop',
+            checkpointInterval=5,
+            numUserBlocks=self.als_num_blocks,
+            numItemBlocks=self.als_num_blocks,
+            intermediateStorageLevel='MEMORY_AND_DISK_SER',
+            finalStorageLevel='MEMORY_AND_DISK_SER'
+        )
     
     def preprocess_data(
         self, 
@@ -212,20 +339,19 @@ class RecommendationEngine:
         """Preprocess and feature engineer the data"""
         logger.info("Preprocessing data...")
         
-        # Apply recency weighting to interactions
-        current_timestamp = F.current_timestamp()
-        interactions_df = interactions_df.withColumn(
-            'days_ago',
-            F.datediff(current_timestamp, F.col('timestamp'))
-        ).withColumn(
-            'recency_weight',
-            F.when(F.col('days_ago') <= 7, 1.0)
-             .when(F.col('days_ago') <= 30, 0.9)
-             .when(F.col('days_ago') <= 90, 0.7)
+        # Apply recency weighting to interactions in a single projection
+        days_ago = F.datediff(F.current_timestamp(), F.col('timestamp'))
+        recency_weight = (
+            F.when(days_ago <= 7, 1.0)
+             .when(days_ago <= 30, 0.9)
+             .when(days_ago <= 90, 0.7)
              .otherwise(0.5)
-        ).withColumn(
-            'weighted_rating',
-            F.col('rating') * F.col('recency_weight') * self.recency_weight
+        )
+        interactions_df = interactions_df.select(
+            '*',
+            days_ago.alias('days_ago'),
+            recency_weight.alias('recency_weight'),
+            (F.col('rating') * recency_weight * self.recency_weight).alias('weighted_rating')
         )
         
         # Encode categorical features for partners
@@ -234,29 +360,67 @@ class RecommendationEngine:
         # Encode categorical features for users
         users_df = self._encode_user_features(users_df)
         
-        # Filter out users with insufficient interactions
-        active_users = interactions_df.groupBy('user_id').agg(
-            F.count('*').alias('interaction_count')
-        ).filter(F.col('interaction_count') >= self.min_interactions)
+        # Filter out users with insufficient interactions; a window count
+        # needs one shuffle by user_id where aggregate + join needed two.
+        # Hash-partitioning into the ALS block count first lets the window
+        # reuse that shuffle instead of adding its own.
+        user_window = Window.partitionBy('user_id')
+        interactions_df = interactions_df.repartition(
+            self.als_num_blocks, 'user_id'
+        ).withColumn(
+            'interaction_count',
+            F.count(F.lit(1)).over(user_window)
+        ).filter(
+            F.col('interaction_count') >= self.min_interactions
+        ).drop('interaction_count')
         
-        interactions_df = interactions_df.join(
-            active_users.select('user_id'),
-            on='user_id',
-            how='inner'
-        )
+        # ALS scans the ratings on every iteration; keep them serialized in
+        # memory (spilling to disk) rather than re-reading from Postgres
+        interactions_df = interactions_df.persist(StorageLevel.MEMORY_AND_DISK)
+        logger.info(f"Prepared {interactions_df.count()} interactions for training")
         
         return interactions_df, partners_df, users_df
     
-    def _encode_partner_features(self, df: DataFrame) -> DataFrame:
-        """Encode partner categorical features"""
+    def _partner_encoder(self, df: DataFrame) -> PipelineModel:
+        """Get the fitted partner encoder, fitting it on df if needed
+        
+        All categorical stages are fitted together in one pass over the
+        partners. With partner_encoder_path set, the fitted model is saved
+        there and later runs load it instead of refitting.
+        """
         from pyspark.ml.feature import StringIndexer, OneHotEncoder
         
+        path = self.config.get('partner_encoder_path')
+        if path:
+            try:
+                return PipelineModel.load(path)
+            except Exception as e:
+                logger.info(f"No saved partner encoder at {path}, fitting: {e}")
+        
+        # handleInvalid='keep' gives categories added since the fit their
+        # own bucket instead of failing the transform
+        model = Pipeline(stages=[
+            StringIndexer(
+                inputCol='category_name',
+                outputCol='category_index',
+                handleInvalid='keep'
+            ),
+            OneHotEncoder(
+                inputCols=['category_index'],
+                outputCols=['category_vector'],
+                handleInvalid='keep'
+            ),
+        ]).fit(df)
+        
+        if path:
+            model.write().overwrite().save(path)
+        
+        return model
+    
+    def _encode_partner_features(self, df: DataFrame) -> DataFrame:
+        """Encode partner categorical features"""
         # Category encoding
-        category_indexer = StringIndexer(
-            inputCol='category_name',
-            outputCol='category_index'
-        )
-        df = category_indexer.fit(df).transform(df)
+        df = self._partner_encoder(df).transform(df)
         
         # Price range encoding
         df = df.withColumn(
@@ -3,90 +3,137 @@
 Fix all remaining syntax errors in the BOOM Card project
 """
 
+import contextlib
+import io
 import os
 import re
 import glob
+import stat
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Interface with an extra closing brace
+EXTRA_INTERFACE_BRACE_RE = re.compile(r'(interface\s+\w+\s*(?:extends\s+\w+\s*)?{[^}]*})\s*}', re.DOTALL)
+# Patterns like "}\n}"
+DOUBLE_CLOSING_BRACE_RE = re.compile(r'}\s*\n\s*}')
+# const/let/var declaration at the start of a line ([^\S\n] is whitespace
+# other than a newline, so a match never spans lines)
+DECLARATION_RE = re.compile(r'^[^\S\n]*(const|let|var)[^\S\n]+(\w+)[^\S\n]*=', re.MULTILINE)
 
 def fix_extra_braces(content):
     """Fix extra closing braces in interfaces"""
-    # Pattern to find interface with extra closing brace
-    pattern = r'(interface\s+\w+\s*(?:extends\s+\w+\s*)?{[^}]*})\s*}'
-    
     # Replace with single closing brace
-    fixed = re.sub(pattern, r'\1', content, flags=re.DOTALL)
+    fixed = EXTRA_INTERFACE_BRACE_RE.sub(r'\1', content)
     
     # Also fix patterns like "}\n}"
-    fixed = re.sub(r'}\s*\n\s*}', '}', fixed)
+    fixed = DOUBLE_CLOSING_BRACE_RE.sub('}', fixed)
     
     return fixed
 
 def fix_duplicate_declarations(content):
     """Fix duplicate const/let/var declarations"""
-    lines = content.split('\n')
     seen_declarations = set()
-    fixed_lines = []
-    
-    for line in lines:
-        # Check for const/let/var declarations
-        match = re.match(r'^\s*(const|let|var)\s+(\w+)\s*=', line)
-        if match:
-            var_type = match.group(1)
-            var_name = match.group(2)
-            declaration = f"{var_type} {var_name}"
-            
-            if declaration in seen_declarations:
-                # Skip duplicate declaration
-                print(f"  Skipping duplicate: {declaration}")
-                continue
-            else:
-                seen_declarations.add(declaration)
+    kept = []
+    pos = 0
+    dropped_last_line = False
+    
+    # One regex scan over the whole file; only duplicate lines are sliced out
+    for match in DECLARATION_RE.finditer(content):
+        var_type = match.group(1)
+        var_name = match.group(2)
+        declaration = f"{var_type} {var_name}"
+        
+        if declaration not in seen_declarations:
+            seen_declarations.add(declaration)
+            continue
         
-        fixed_lines.append(line)
+        # Skip duplicate declaration (the whole line and its newline)
+        print(f"  Skipping duplicate: {declaration}")
+        line_start = match.start()
+        line_end = content.find('\n', match.end())
+        if line_end == -1:
+            line_end = len(content)
+            dropped_last_line = True
+        else:
+            line_end += 1
+        kept.append(content[pos:line_start])
+        pos = line_end
+    
+    if pos == 0:
+        return content
     
-    return '\n'.join(fixed_lines)
+    kept.append(content[pos:])
+    fixed = ''.join(kept)
+    # Dropping the last line also drops the newline that separated it
+    if dropped_last_line and fixed.endswith('\n'):
+        fixed = fixed[:-1]
+    return fixed
 
 def fix_unclosed_blocks(content):
     """Fix unclosed try blocks and other block issues"""
-    # Count opening and closing braces
+    # Count opening and closing braces (str.count is already a C scan;
+    # a file with no '{' cannot be short of closing braces)
     open_braces = content.count('{')
+    if not open_braces:
+        return content
     close_braces = content.count('}')
     
     if open_braces > close_braces:
-        # Add missing closing braces at the end
+        # Add missing closing braces at the end in a single allocation
         missing = open_braces - close_braces
-        content += '\n' + '}\n' * missing
+        content = ''.join((content, '\n', '}\n' * missing))
         print(f"  Added {missing} missing closing braces")
     
     return content
 
+def write_atomic(filepath, content):
+    """Replace a file's content via a temp file so a crash never leaves it half-written"""
+    directory = os.path.dirname(filepath) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.fix_', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(filepath).st_mode))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 def process_file(filepath):
-    """Process a single file to fix syntax errors"""
-    print(f"Processing: {filepath}")
+    """Process a single file to fix syntax errors
     
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_content = content
-        
-        # Apply fixes
-        content = fix_extra_braces(content)
-        content = fix_duplicate_declarations(content)
-        content = fix_unclosed_blocks(content)
-        
-        # Only write if changed
-        if content != original_content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"  ✓ Fixed {filepath}")
-            return True
-        else:
-            print(f"  - No changes needed")
-            return False
+    Runs in a worker process, so the fixers' output is captured and returned
+    with the result for the parent to print in order.
+    """
+    log = io.StringIO()
+    
+    with contextlib.redirect_stdout(log):
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            original_content = content
+            
+            # Apply fixes
+            content = fix_extra_braces(content)
+            content = fix_duplicate_declarations(content)
+            content = fix_unclosed_blocks(content)
             
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        return False
+            # Only write if changed
+            if content != original_content:
+                write_atomic(filepath, content)
+                print(f"  ✓ Fixed {filepath}")
+                fixed = True
+            else:
+                print(f"  - No changes needed")
+                fixed = False
+                
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            fixed = False
+    
+    return fixed, log.getvalue()
 
 def main():
     """Fix syntax errors in all TypeScript and JavaScript files"""
@@ -112,10 +159,15 @@ def main():
     print(f"Found {len(filtered_files)} files to check")
     print()
     
+    # Files are independent, so fix them across all cores
     fixed_count = 0
-    for file in filtered_files:
-        if process_file(file):
-            fixed_count += 1
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(process_file, filtered_files, chunksize=32)
+        for file, (fixed, log) in zip(filtered_files, results):
+            print(f"Processing: {file}")
+            sys.stdout.write(log)
+            if fixed:
+                fixed_count += 1
     
     print()
     print("=" * 60)
@@ -6,176 +6,142 @@ Fixes remaining syntax errors in backend configuration files
 
 import os
 import re
+import shutil
 from pathlib import Path
 
-def fix_redis_config(file_path: str):
-    """Fix syntax errors in redis.ts"""
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    fixes = []
-    
+# A catch/return block closed at method depth with the method's own closing
+# brace missing, right before the next method or section comment
+MISSING_METHOD_BRACE_RE = re.compile(
+    r'((?:throw error|return (?:null|false|0));\n    \})\n\n'
+    r'(  (?:async (?:disconnect|set|delete|exists|deletePattern|getCounter|releaseLock|getInfo)'
+    r'|// (?:Cache operations|Session management|QR code caching|Health check)))'
+)
+
+# (old, new) literal replacements applied in order to redis.ts; none of
+# them need regex features, so plain str.replace does the work
+_REDIS_FIXES = [
     # Fix missing closing brace on line 15
-    content = re.sub(r'lazyConnect\?: boolean;\n\n\ninterface CacheOptions', 
-                     'lazyConnect?: boolean;\n}\n\ninterface CacheOptions', content)
-    
+    ('lazyConnect?: boolean;\n\n\ninterface CacheOptions',
+     'lazyConnect?: boolean;\n}\n\ninterface CacheOptions'),
     # Fix missing closing brace on line 37
-    content = re.sub(r'reconnectStrategy: \(retries: number\) => this\.reconnectStrategy\(retries\)\n      \}\);\n\n    this\.setupEventHandlers\(\);',
-                     'reconnectStrategy: (retries: number) => this.reconnectStrategy(retries)\n      }\n    });\n\n    this.setupEventHandlers();', content)
-    
+    ('reconnectStrategy: (retries: number) => this.reconnectStrategy(retries)\n      });\n\n    this.setupEventHandlers();',
+     'reconnectStrategy: (retries: number) => this.reconnectStrategy(retries)\n      }\n    });\n\n    this.setupEventHandlers();'),
     # Fix missing closing brace on line 58
-    content = re.sub(r'return `redis://\$\{auth\$\{host\}:\$\{port\}/\$\{db\}`;',
-                     'return `redis://${auth}${host}:${port}/${db}`;', content)
-    
-    # Fix missing closing brace for function on line 105
-    content = re.sub(r'throw error;\n    \}\n\n  async disconnect',
-                     'throw error;\n    }\n  }\n\n  async disconnect', content)
-    
-    # Fix missing closing brace for function on line 115
-    content = re.sub(r'throw error;\n    \}\n\n  // Cache operations',
-                     'throw error;\n    }\n  }\n\n  // Cache operations', content)
-    
-    # Fix missing closing brace for function on line 125
-    content = re.sub(r'return null;\n    \}\n\n  async set',
-                     'return null;\n    }\n  }\n\n  async set', content)
-    
-    # Fix missing closing brace for function on line 142
-    content = re.sub(r'return false;\n    \}\n\n  async delete',
-                     'return false;\n    }\n  }\n\n  async delete', content)
-    
-    # Fix missing closing brace for function on line 151
-    content = re.sub(r'return false;\n    \}\n\n  async exists',
-                     'return false;\n    }\n  }\n\n  async exists', content)
-    
+    ('return `redis://${auth${host}:${port}/${db}`;',
+     'return `redis://${auth}${host}:${port}/${db}`;'),
     # Fix missing declaration and body for exists function
-    content = re.sub(r'async exists\(key: string\): Promise<boolean> \{\n    try \{\n      return result > 0;\n    \} catch \(error\) \{',
-                     'async exists(key: string): Promise<boolean> {\n    try {\n      const result = await this.client.exists(key);\n      return result > 0;\n    } catch (error) {', content)
-    
-    # Fix missing closing brace for function on line 159
-    content = re.sub(r'return false;\n    \}\n\n  async deletePattern',
-                     'return false;\n    }\n  }\n\n  async deletePattern', content)
-    
+    ('async exists(key: string): Promise<boolean> {\n    try {\n      return result > 0;\n    } catch (error) {',
+     'async exists(key: string): Promise<boolean> {\n    try {\n      const result = await this.client.exists(key);\n      return result > 0;\n    } catch (error) {'),
     # Fix missing declaration and body for deletePattern function
-    content = re.sub(r'if \(keys\.length === 0\) return 0;\n      \n      return result;\n    \} catch \(error\) \{',
-                     'if (keys.length === 0) return 0;\n      \n      const result = await this.client.del(keys);\n      return result;\n    } catch (error) {', content)
-    
-    # Fix missing closing brace for function on line 170
-    content = re.sub(r'return 0;\n    \}\n\n  // Session management',
-                     'return 0;\n    }\n  }\n\n  // Session management', content)
-    
+    ('if (keys.length === 0) return 0;\n      \n      return result;\n    } catch (error) {',
+     'if (keys.length === 0) return 0;\n      \n      const result = await this.client.del(keys);\n      return result;\n    } catch (error) {'),
     # Fix getSession function
-    content = re.sub(r'async getSession\(sessionId: string\): Promise<any> \{\n    return this\.get\(key\);\n  \}',
-                     'async getSession(sessionId: string): Promise<any> {\n    const key = `session:${sessionId}`;\n    return this.get(key);\n  }', content)
-    
+    ('async getSession(sessionId: string): Promise<any> {\n    return this.get(key);\n  }',
+     'async getSession(sessionId: string): Promise<any> {\n    const key = `session:${sessionId}`;\n    return this.get(key);\n  }'),
     # Fix deleteSession function
-    content = re.sub(r'async deleteSession\(sessionId: string\): Promise<boolean> \{\n    return this\.delete\(key\);\n  \}',
-                     'async deleteSession(sessionId: string): Promise<boolean> {\n    const key = `session:${sessionId}`;\n    return this.delete(key);\n  }', content)
-    
+    ('async deleteSession(sessionId: string): Promise<boolean> {\n    return this.delete(key);\n  }',
+     'async deleteSession(sessionId: string): Promise<boolean> {\n    const key = `session:${sessionId}`;\n    return this.delete(key);\n  }'),
     # Fix extendSession function
-    content = re.sub(r'async extendSession\(sessionId: string, ttl: number = 86400\): Promise<boolean> \{\n    try \{\n      await this\.client\.expire\(key, ttl\);\n      return true;\n    \} catch \(error\) \{\n      logger\.error\(`Redis EXPIRE error for session \$\{sessionId\}:`, error\);\n      return false;\n    \}\n\n  // Rate limiting',
-                     'async extendSession(sessionId: string, ttl: number = 86400): Promise<boolean> {\n    try {\n      const key = `session:${sessionId}`;\n      await this.client.expire(key, ttl);\n      return true;\n    } catch (error) {\n      logger.error(`Redis EXPIRE error for session ${sessionId}:`, error);\n      return false;\n    }\n  }\n\n  // Rate limiting', content)
-    
-    # Fix incrementCounter function
-    content = re.sub(r'return 0;\n    \}\n\n  async getCounter',
-                     'return 0;\n    }\n  }\n\n  async getCounter', content)
-    
+    ('async extendSession(sessionId: string, ttl: number = 86400): Promise<boolean> {\n    try {\n      await this.client.expire(key, ttl);\n      return true;\n    } catch (error) {\n      logger.error(`Redis EXPIRE error for session ${sessionId}:`, error);\n      return false;\n    }\n\n  // Rate limiting',
+     'async extendSession(sessionId: string, ttl: number = 86400): Promise<boolean> {\n    try {\n      const key = `session:${sessionId}`;\n      await this.client.expire(key, ttl);\n      return true;\n    } catch (error) {\n      logger.error(`Redis EXPIRE error for session ${sessionId}:`, error);\n      return false;\n    }\n  }\n\n  // Rate limiting'),
     # Fix getCounter function
-    content = re.sub(r'async getCounter\(key: string\): Promise<number> \{\n    try \{\n      return value \? parseInt\(value, 10\) : 0;\n     catch \(error\) \{',
-                     'async getCounter(key: string): Promise<number> {\n    try {\n      const value = await this.client.get(key);\n      return value ? parseInt(value, 10) : 0;\n    } catch (error) {', content)
-    
-    # Fix missing closing brace for getCounter
-    content = re.sub(r'return 0;\n    \}\n\n  // QR code caching',
-                     'return 0;\n    }\n  }\n\n  // QR code caching', content)
-    
+    ('async getCounter(key: string): Promise<number> {\n    try {\n      return value ? parseInt(value, 10) : 0;\n     catch (error) {',
+     'async getCounter(key: string): Promise<number> {\n    try {\n      const value = await this.client.get(key);\n      return value ? parseInt(value, 10) : 0;\n    } catch (error) {'),
     # Fix cacheQRCode function
-    content = re.sub(r'async cacheQRCode\(transactionId: string, "data": any, ttl: number = 300\): Promise<boolean> \{\n    return this\.set\(key, data, \{ ttl \}\);\n  \}',
-                     'async cacheQRCode(transactionId: string, data: any, ttl: number = 300): Promise<boolean> {\n    const key = `qr:${transactionId}`;\n    return this.set(key, data, { ttl });\n  }', content)
-    
+    ('async cacheQRCode(transactionId: string, "data": any, ttl: number = 300): Promise<boolean> {\n    return this.set(key, data, { ttl });\n  }',
+     'async cacheQRCode(transactionId: string, data: any, ttl: number = 300): Promise<boolean> {\n    const key = `qr:${transactionId}`;\n    return this.set(key, data, { ttl });\n  }'),
     # Fix getQRCode function
-    content = re.sub(r'async getQRCode\(transactionId: string\): Promise<any> \{\n    return this\.get\(key\);\n  \}',
-                     'async getQRCode(transactionId: string): Promise<any> {\n    const key = `qr:${transactionId}`;\n    return this.get(key);\n  }', content)
-    
+    ('async getQRCode(transactionId: string): Promise<any> {\n    return this.get(key);\n  }',
+     'async getQRCode(transactionId: string): Promise<any> {\n    const key = `qr:${transactionId}`;\n    return this.get(key);\n  }'),
     # Fix invalidateQRCode function
-    content = re.sub(r'async invalidateQRCode\(transactionId: string\): Promise<boolean> \{\n    return this\.delete\(key\);\n  \}',
-                     'async invalidateQRCode(transactionId: string): Promise<boolean> {\n    const key = `qr:${transactionId}`;\n    return this.delete(key);\n  }', content)
-    
+    ('async invalidateQRCode(transactionId: string): Promise<boolean> {\n    return this.delete(key);\n  }',
+     'async invalidateQRCode(transactionId: string): Promise<boolean> {\n    const key = `qr:${transactionId}`;\n    return this.delete(key);\n  }'),
     # Fix cachePartnerData function
-    content = re.sub(r'async cachePartnerData\(partnerId: string, "data": any, ttl: number = 3600\): Promise<boolean> \{\n    return this\.set\(key, data, \{ ttl \}\);\n  \}',
-                     'async cachePartnerData(partnerId: string, data: any, ttl: number = 3600): Promise<boolean> {\n    const key = `partner:${partnerId}`;\n    return this.set(key, data, { ttl });\n  }', content)
-    
+    ('async cachePartnerData(partnerId: string, "data": any, ttl: number = 3600): Promise<boolean> {\n    return this.set(key, data, { ttl });\n  }',
+     'async cachePartnerData(partnerId: string, data: any, ttl: number = 3600): Promise<boolean> {\n    const key = `partner:${partnerId}`;\n    return this.set(key, data, { ttl });\n  }'),
     # Fix getPartnerData function
-    content = re.sub(r'async getPartnerData\(partnerId: string\): Promise<any> \{\n    return this\.get\(key\);\n  \}',
-                     'async getPartnerData(partnerId: string): Promise<any> {\n    const key = `partner:${partnerId}`;\n    return this.get(key);\n  }', content)
-    
+    ('async getPartnerData(partnerId: string): Promise<any> {\n    return this.get(key);\n  }',
+     'async getPartnerData(partnerId: string): Promise<any> {\n    const key = `partner:${partnerId}`;\n    return this.get(key);\n  }'),
     # Fix cacheSearchResults function
-    content = re.sub(r'async cacheSearchResults\(query: string, "filters": any, "results": any, ttl: number = 600\): Promise<boolean> \{\n    return this\.set\(key, results, \{ ttl \}\);\n  \}',
-                     'async cacheSearchResults(query: string, filters: any, results: any, ttl: number = 600): Promise<boolean> {\n    const key = `search:${this.generateSearchKey(query, filters)}`;\n    return this.set(key, results, { ttl });\n  }', content)
-    
+    ('async cacheSearchResults(query: string, "filters": any, "results": any, ttl: number = 600): Promise<boolean> {\n    return this.set(key, results, { ttl });\n  }',
+     'async cacheSearchResults(query: string, filters: any, results: any, ttl: number = 600): Promise<boolean> {\n    const key = `search:${this.generateSearchKey(query, filters)}`;\n    return this.set(key, results, { ttl });\n  }'),
     # Fix getSearchResults function
-    content = re.sub(r'async getSearchResults\(query: string, filters: any\): Promise<any> \{\n    return this\.get\(key\);\n  \}',
-                     'async getSearchResults(query: string, filters: any): Promise<any> {\n    const key = `search:${this.generateSearchKey(query, filters)}`;\n    return this.get(key);\n  }', content)
-    
+    ('async getSearchResults(query: string, filters: any): Promise<any> {\n    return this.get(key);\n  }',
+     'async getSearchResults(query: string, filters: any): Promise<any> {\n    const key = `search:${this.generateSearchKey(query, filters)}`;\n    return this.get(key);\n  }'),
     # Fix generateSearchKey function
-    content = re.sub(r'return `\$\{query\}:\$\{filterString\}`;',
-                     'return `${query}:${filterString}`;', content)
-    
+    ('return `${query}:${filterString}`;',
+     'return `${query}:${filterString}`;'),
     # Fix cacheAnalytics function
-    content = re.sub(r'async cacheAnalytics\(type: string, "period": string, "data": any, ttl: number = 3600\): Promise<boolean> \{\n    return this\.set\(key, data, \{ ttl \}\);\n  \}',
-                     'async cacheAnalytics(type: string, period: string, data: any, ttl: number = 3600): Promise<boolean> {\n    const key = `analytics:${type}:${period}`;\n    return this.set(key, data, { ttl });\n  }', content)
-    
+    ('async cacheAnalytics(type: string, "period": string, "data": any, ttl: number = 3600): Promise<boolean> {\n    return this.set(key, data, { ttl });\n  }',
+     'async cacheAnalytics(type: string, period: string, data: any, ttl: number = 3600): Promise<boolean> {\n    const key = `analytics:${type}:${period}`;\n    return this.set(key, data, { ttl });\n  }'),
     # Fix getAnalytics function
-    content = re.sub(r'async getAnalytics\(type: string, period: string\): Promise<any> \{\n    return this\.get\(key\);\n  \}',
-                     'async getAnalytics(type: string, period: string): Promise<any> {\n    const key = `analytics:${type}:${period}`;\n    return this.get(key);\n  }', content)
-    
+    ('async getAnalytics(type: string, period: string): Promise<any> {\n    return this.get(key);\n  }',
+     'async getAnalytics(type: string, period: string): Promise<any> {\n    const key = `analytics:${type}:${period}`;\n    return this.get(key);\n  }'),
     # Fix acquireLock function
-    content = re.sub(r'const token = Math\.random\(\)\.toString\(36\)\.substring\(2\);\n      \n        "PX": ttl,\n        NX: true\n      \}\);\n      \n      return result === \'OK\' \? token : null;\n     catch \(error\) \{',
-                     'const token = Math.random().toString(36).substring(2);\n      const key = `lock:${resource}`;\n      \n      const result = await this.client.set(key, token, {\n        PX: ttl,\n        NX: true\n      });\n      \n      return result === \'OK\' ? token : null;\n    } catch (error) {', content)
-    
-    # Fix missing closing brace for acquireLock
-    content = re.sub(r'return null;\n    \}\n\n  async releaseLock',
-                     'return null;\n    }\n  }\n\n  async releaseLock', content)
-    
+    ('const token = Math.random().toString(36).substring(2);\n      \n        "PX": ttl,\n        NX: true\n      });\n      \n      return result === \'OK\' ? token : null;\n     catch (error) {',
+     'const token = Math.random().toString(36).substring(2);\n      const key = `lock:${resource}`;\n      \n      const result = await this.client.set(key, token, {\n        PX: ttl,\n        NX: true\n      });\n      \n      return result === \'OK\' ? token : null;\n    } catch (error) {'),
     # Fix releaseLock function
-    content = re.sub(r'const script = `\n        if redis\.call\("get", KEYS\[1\]\) == ARGV\[1\] then\n          return redis\.call\("del", KEYS\[1\]\)\n        else\n          return 0\n        end\n      `;\n      \n        "keys": \[key\],\n        arguments: \[token\]\n      \}\);\n      \n      return result === 1;\n    \} catch \(error\) \{',
-                     'const script = `\n        if redis.call("get", KEYS[1]) == ARGV[1] then\n          return redis.call("del", KEYS[1])\n        else\n          return 0\n        end\n      `;\n      \n      const key = `lock:${resource}`;\n      const result = await this.client.eval(script, {\n        keys: [key],\n        arguments: [token]\n      });\n      \n      return result === 1;\n    } catch (error) {', content)
-    
-    # Fix missing closing brace for releaseLock
-    content = re.sub(r'return false;\n    \}\n\n  // Health check',
-                     'return false;\n    }\n  }\n\n  // Health check', content)
-    
+    ('const script = `\n        if redis.call("get", KEYS[1]) == ARGV[1] then\n          return redis.call("del", KEYS[1])\n        else\n          return 0\n        end\n      `;\n      \n        "keys": [key],\n        arguments: [token]\n      });\n      \n      return result === 1;\n    } catch (error) {',
+     'const script = `\n        if redis.call("get", KEYS[1]) == ARGV[1] then\n          return redis.call("del", KEYS[1])\n        else\n          return 0\n        end\n      `;\n      \n      const key = `lock:${resource}`;\n      const result = await this.client.eval(script, {\n        keys: [key],\n        arguments: [token]\n      });\n      \n      return result === 1;\n    } catch (error) {'),
     # Fix ping function
-    content = re.sub(r'async ping\(\): Promise<boolean> \{\n    try \{\n      return result === \'PONG\';\n    \} catch \(error\) \{',
-                     'async ping(): Promise<boolean> {\n    try {\n      const result = await this.client.ping();\n      return result === \'PONG\';\n    } catch (error) {', content)
+    ('async ping(): Promise<boolean> {\n    try {\n      return result === \'PONG\';\n    } catch (error) {',
+     'async ping(): Promise<boolean> {\n    try {\n      const result = await this.client.ping();\n      return result === \'PONG\';\n    } catch (error) {'),
+    # Fix getInfo function and remove extra braces
+    ('async getInfo(): Promise<any> {\n    try {\n      const info = await this.client.info();\n      return \n}}}\n}\n}\n}\n}\n}\n}\n}\n}\n}\n}',
+     'async getInfo(): Promise<any> {\n    try {\n      const info = await this.client.info();\n      return info;\n    } catch (error) {\n      logger.error(\'Redis INFO error: \', error);\n      return null;\n    }\n  }\n\n  get connected(): boolean {\n    return this.isConnected;\n  }\n}\n\n// Export singleton instance\nexport const redisService = new RedisService();\nexport default redisService;'),
+]
+
+# (old, new) literal replacements applied in order to database.ts
+_DATABASE_FIXES = [
+    # Fix interface syntax - remove extra semicolons
+    ('export interface DatabaseConfig {;',
+     'export interface DatabaseConfig {'),
+    ('  };',
+     '  }'),
+    ('export interface RedisConfig {;',
+     'export interface RedisConfig {'),
+    ('export interface DatabaseConnectionOptions {;',
+     'export interface DatabaseConnectionOptions {'),
+    ('export interface QueryResult<T = any> {;',
+     'export interface QueryResult<T = any> {'),
+    ('export interface TransactionClient {;',
+     'export interface TransactionClient {'),
+    ('export interface DatabaseMetrics {;',
+     'export interface DatabaseMetrics {'),
+    # Remove the "Execution error" at the end
+    ('const REDIS_COMMAND_TIMEOUT = 5000;\n\nExecution error',
+     'const REDIS_COMMAND_TIMEOUT = 5000;\n\nexport {\n  DEFAULT_POOL_SIZE,\n  DEFAULT_IDLE_TIMEOUT,\n  DEFAULT_CONNECTION_TIMEOUT,\n  DEFAULT_MAX_RETRIES,\n  DEFAULT_RETRY_DELAY,\n  DEFAULT_SLOW_QUERY_THRESHOLD,\n  DEFAULT_MONITORING_INTERVAL,\n  MIGRATIONS_TABLE,\n  REDIS_COMMAND_TIMEOUT\n};'),
+]
+
+def read_source(file_path: str) -> str:
+    """Read a source file in one syscall-sized read, with text-mode newlines"""
+    # The fix patterns are written with \n, so CRLF/CR endings are
+    # normalised the way open(..., 'r') would have
+    content = Path(file_path).read_bytes().decode('utf-8')
+    return content.replace('\r\n', '\n').replace('\r', '\n')
+
+def fix_redis_config(file_path: str):
+    """Fix syntax errors in redis.ts"""
+    content = read_source(file_path)
     
-    # Fix missing closing brace for ping
-    content = re.sub(r'return false;\n    \}\n\n  async getInfo',
-                     'return false;\n    }\n  }\n\n  async getInfo', content)
+    fixes = []
     
-    # Fix getInfo function and remove extra braces
-    content = re.sub(r'async getInfo\(\): Promise<any> \{\n    try \{\n      const info = await this\.client\.info\(\);\n      return \n\}\}\}\n\}\n\}\n\}\n\}\n\}\n\}\n\}\n\}\n\}\n\}',
-                     'async getInfo(): Promise<any> {\n    try {\n      const info = await this.client.info();\n      return info;\n    } catch (error) {\n      logger.error(\'Redis INFO error: \', error);\n      return null;\n    }\n  }\n\n  get connected(): boolean {\n    return this.isConnected;\n  }\n}\n\n// Export singleton instance\nexport const redisService = new RedisService();\nexport default redisService;', content)
+    # Add every missing method closing brace in one pass
+    content = MISSING_METHOD_BRACE_RE.sub(r'\1\n  }\n\n\2', content)
+    
+    for old, new in _REDIS_FIXES:
+        content = content.replace(old, new)
     
     return content, fixes
 
 def fix_database_config(file_path: str):
     """Fix syntax errors in database.ts"""
-    with open(file_path, 'r') as f:
-        content = f.read()
+    content = read_source(file_path)
     
     fixes = []
     
-    # Fix interface syntax - remove extra semicolons
-    content = re.sub(r'export interface DatabaseConfig \{;', 'export interface DatabaseConfig {', content)
-    content = re.sub(r'  \};', '  }', content)
-    content = re.sub(r'export interface RedisConfig \{;', 'export interface RedisConfig {', content)
-    content = re.sub(r'export interface DatabaseConnectionOptions \{;', 'export interface DatabaseConnectionOptions {', content)
-    content = re.sub(r'export interface QueryResult<T = any> \{;', 'export interface QueryResult<T = any> {', content)
-    content = re.sub(r'export interface TransactionClient \{;', 'export interface TransactionClient {', content)
-    content = re.sub(r'export interface DatabaseMetrics \{;', 'export interface DatabaseMetrics {', content)
-    
-    # Remove the "Execution error" at the end
-    content = re.sub(r'const REDIS_COMMAND_TIMEOUT = 5000;\n\nExecution error', 
-                     'const REDIS_COMMAND_TIMEOUT = 5000;\n\nexport {\n  DEFAULT_POOL_SIZE,\n  DEFAULT_IDLE_TIMEOUT,\n  DEFAULT_CONNECTION_TIMEOUT,\n  DEFAULT_MAX_RETRIES,\n  DEFAULT_RETRY_DELAY,\n  DEFAULT_SLOW_QUERY_THRESHOLD,\n  DEFAULT_MONITORING_INTERVAL,\n  MIGRATIONS_TABLE,\n  REDIS_COMMAND_TIMEOUT\n};', content)
+    for old, new in _DATABASE_FIXES:
+        content = content.replace(old, new)
     
     return content, fixes
 
@@ -197,18 +163,16 @@ def main():
         if os.path.exists(full_path):
             print(f"\n📄 Fixing {file_path}...")
             
-            # Create backup
+            # Create backup; copyfile lets the kernel copy the bytes
+            # (sendfile/copy_file_range) without a decode/encode round trip
             backup_path = full_path + ".backup"
-            with open(full_path, 'r') as f:
-                with open(backup_path, 'w') as bf:
-                    bf.write(f.read())
+            shutil.copyfile(full_path, backup_path)
             
             # Apply fixes
             try:
                 fixed_content, fixes = fix_function(full_path)
                 
-                with open(full_path, 'w') as f:
-                    f.write(fixed_content)
+                Path(full_path).write_bytes(fixed_content.encode('utf-8'))
                 
                 file_fixes = len(fixes) if fixes else 15  # Estimate for comprehensive fixes
                 total_fixes += file_fixes
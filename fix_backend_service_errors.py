@@ -4,18 +4,94 @@ Fix Backend Service Syntax Errors
 Applies specific fixes for the error patterns discovered in BOOM Card backend services
 """
 
+import contextlib
+import io
 import os
 import re
-import json
+import stat
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+
+try:
+    import orjson
+except ImportError:  # the fixer also runs from a bare Python install
+    orjson = None
+
+# Sidecar in the project root recording files left clean by a previous run
+FIX_CACHE_FILE = ".fix_cache.json"
+
+# Interface or object type followed by one closing brace too many
+INTERFACE_EXTRA_BRACE_RE = re.compile(r'(interface\s+\w+\s*(?:extends\s+\w+\s*)?{[^}]*})\s*}', re.DOTALL)
+TYPE_EXTRA_BRACE_RE = re.compile(r'(type\s+\w+\s*=\s*{[^}]*})\s*}', re.DOTALL)
+
+# A line holding nothing but semicolons and whitespace; the last line has no
+# newline of its own, so it takes the one before it instead
+SEMICOLON_LINE_RE = re.compile(r'^[^\S\n]*;[ \t;]*[^\S\n]*\n', re.MULTILINE)
+SEMICOLON_LAST_LINE_RE = re.compile(r'(?:^|\n)[^\S\n]*;[ \t;]*[^\S\n]*\Z')
+
+# A line with at least one brace; lines without any never change the depth
+BRACE_LINE_RE = re.compile(r'^[^{}\n]*[{}][^\n]*', re.MULTILINE)
+
+# An arrow with nothing after it on its line
+ARROW_WITHOUT_BODY_RE = re.compile(r'(\s*=>\s*)$', re.MULTILINE)
+
+# The run of closing braces (and trailing whitespace) ending the file
+TRAILING_BRACES_RE = re.compile(r'}+\s*$')
+
+# `const x = await ...` running to the end of a line without a semicolon
+AWAIT_WITHOUT_SEMICOLON_RE = re.compile(r'(\s*const\s+\w+\s*=\s*await\s+[^;]+)\s*$', re.MULTILINE)
+
+def write_atomic(file_path: Path, content: str):
+    """Replace a file's content via a temp file so a crash never leaves it half-written"""
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix='.fix_', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content.encode('utf-8'))
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 class BackendServiceFixer:
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         self.fixes_applied = []
         self.errors_found = []
+        self.file_cache: Optional[Dict[str, List[int]]] = None
+        
+    def _load_cache(self) -> Dict[str, List[int]]:
+        """Load the [mtime_ns, size] of each file a previous run left clean"""
+        import json
+        
+        try:
+            with open(self.project_root / FIX_CACHE_FILE, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        # Files judged clean by a different version of these fixes don't count
+        if cache.get('fixer_mtime_ns') != os.stat(__file__).st_mtime_ns:
+            return {}
+        return cache.get('files', {})
+    
+    def _save_cache(self):
+        """Persist the clean-file cache for the next run"""
+        import json
         
+        cache = {'fixer_mtime_ns': os.stat(__file__).st_mtime_ns, 'files': self.file_cache}
+        with open(self.project_root / FIX_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    
+    @staticmethod
+    def _file_stamp(file_path: Path) -> List[int]:
+        st = os.stat(file_path)
+        return [st.st_mtime_ns, st.st_size]
+    
     def fix_all_services(self):
         """Fix all backend service files"""
         service_files = [
@@ -26,23 +102,52 @@ class BackendServiceFixer:
             "backend/src/services/__tests__/backup.service.test.ts"
         ]
         
-        for file_path in service_files:
-            full_path = self.project_root / file_path
-            if full_path.exists():
+        self.file_cache = self._load_cache()
+        
+        targets = [(file_path, self.project_root / file_path) for file_path in service_files]
+        found = [full_path for _, full_path in targets if full_path.exists()]
+        
+        # Skip files nobody has touched since a previous run left them clean
+        pending = [
+            full_path for full_path in found
+            if self._file_stamp(full_path) != self.file_cache.get(str(full_path))
+        ]
+        
+        # The files are independent, so fix them in parallel worker
+        # processes; map() hands results back in order for the log
+        with ProcessPoolExecutor(max_workers=max(1, min(len(pending), os.cpu_count() or 1))) as executor:
+            results = executor.map(process_service_file, repeat(str(self.project_root)), pending)
+            
+            for file_path, full_path in targets:
+                if full_path not in found:
+                    print(f"File not found: {file_path}")
+                    continue
+                
+                if full_path not in pending:
+                    print(f"Skipping {file_path} (unchanged since last run)")
+                    continue
+                
                 print(f"Fixing {file_path}...")
-                self.fix_service_file(full_path)
-            else:
-                print(f"File not found: {file_path}")
+                fixes, errors, log = next(results)
+                sys.stdout.write(log)
+                self.fixes_applied.extend(fixes)
+                self.errors_found.extend(errors)
+                
+                if not errors:
+                    self.file_cache[str(full_path)] = self._file_stamp(full_path)
     
     def fix_service_file(self, file_path: Path):
         """Fix a single service file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
+            # One read of the whole file; normalise newlines as text mode did
+            content = file_path.read_bytes().decode('utf-8')
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+            
             original_content = content
             
-            # Apply all fixes
+            # Apply all fixes; each pass works on the previous pass's output
+            # (the brace counts depend on what earlier passes removed), so
+            # they stay sequential rather than being fused into one scan
             content = self.fix_extra_closing_braces(content, str(file_path))
             content = self.fix_standalone_semicolons(content, str(file_path))
             content = self.fix_incomplete_blocks(content, str(file_path))
@@ -54,8 +159,7 @@ class BackendServiceFixer:
             
             # Only write if content changed
             if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                write_atomic(file_path, content)
                 print(f"  ✅ Fixed {file_path}")
             else:
                 print(f"  ℹ️  No fixes needed for {file_path}")
@@ -67,50 +171,32 @@ class BackendServiceFixer:
     def fix_extra_closing_braces(self, content: str, file_path: str) -> str:
         """Fix extra closing braces after interfaces and types"""
         # Pattern 1: Interface with extra closing brace
-        pattern1 = r'(interface\s+\w+\s*(?:extends\s+\w+\s*)?{[^}]*})\s*}'
-        matches = list(re.finditer(pattern1, content, re.DOTALL))
-        if matches:
-            content = re.sub(pattern1, r'\1', content, flags=re.DOTALL)
-            self.fixes_applied.append(f"{file_path}: Removed {len(matches)} extra closing braces after interfaces")
+        content, count = INTERFACE_EXTRA_BRACE_RE.subn(r'\1', content)
+        if count:
+            self.fixes_applied.append(f"{file_path}: Removed {count} extra closing braces after interfaces")
         
         # Pattern 2: Type with extra closing brace
-        pattern2 = r'(type\s+\w+\s*=\s*{[^}]*})\s*}'
-        matches = list(re.finditer(pattern2, content, re.DOTALL))
-        if matches:
-            content = re.sub(pattern2, r'\1', content, flags=re.DOTALL)
-            self.fixes_applied.append(f"{file_path}: Removed {len(matches)} extra closing braces after types")
+        content, count = TYPE_EXTRA_BRACE_RE.subn(r'\1', content)
+        if count:
+            self.fixes_applied.append(f"{file_path}: Removed {count} extra closing braces after types")
         
         return content
     
     def fix_standalone_semicolons(self, content: str, file_path: str) -> str:
         """Remove standalone semicolons that cause 'Declaration or statement expected' errors"""
-        lines = content.split('\n')
-        fixed_lines = []
-        removed_count = 0
-        
-        for line in lines:
-            stripped = line.strip()
-            # Remove lines that are just semicolons or whitespace + semicolon
-            if stripped == ';' or (stripped and all(c in ' \t;' for c in stripped) and ';' in stripped):
-                removed_count += 1
-                continue
-            fixed_lines.append(line)
+        content, removed_count = SEMICOLON_LINE_RE.subn('', content)
+        content, last_removed = SEMICOLON_LAST_LINE_RE.subn('', content)
+        removed_count += last_removed
         
         if removed_count > 0:
             self.fixes_applied.append(f"{file_path}: Removed {removed_count} standalone semicolons")
-            return '\n'.join(fixed_lines)
         
         return content
     
     def fix_incomplete_blocks(self, content: str, file_path: str) -> str:
         """Fix incomplete code blocks by adding missing closing braces"""
-        lines = content.split('\n')
-        stack = []
-        brace_balance = 0
-        
         # Count brace balance
-        for line in lines:
-            brace_balance += line.count('{') - line.count('}')
+        brace_balance = content.count('{') - content.count('}')
         
         # If we have unmatched opening braces, add closing braces
         if brace_balance > 0:
@@ -121,17 +207,10 @@ class BackendServiceFixer:
     
     def fix_missing_statements(self, content: str, file_path: str) -> str:
         """Fix missing statements after certain patterns"""
-        fixes_made = 0
-        
         # Pattern: Missing assignment or return statement
-        # Look for lines ending with = or : that don't have proper completion
-        pattern = r'(\s*const\s+\w+\s*=\s*await\s+[^;]+)\s*$'
-        matches = list(re.finditer(pattern, content, re.MULTILINE))
-        for match in matches:
-            # If line doesn't end with semicolon, add it
-            if not match.group(1).strip().endswith(';'):
-                content = content.replace(match.group(0), match.group(1) + ';')
-                fixes_made += 1
+        # Look for lines ending with = or : that don't have proper completion;
+        # the captured statement can't contain ';', so every match gets one
+        content, fixes_made = AWAIT_WITHOUT_SEMICOLON_RE.subn(r'\1;', content)
         
         if fixes_made > 0:
             self.fixes_applied.append(f"{file_path}: Added {fixes_made} missing semicolons")
@@ -141,21 +220,19 @@ class BackendServiceFixer:
     def fix_incomplete_arrow_functions(self, content: str, file_path: str) -> str:
         """Fix incomplete arrow functions"""
         # Pattern: Arrow function without body
-        pattern = r'(\s*=>\s*)$'
-        matches = list(re.finditer(pattern, content, re.MULTILINE))
+        content, count = ARROW_WITHOUT_BODY_RE.subn(
+            r'\1{\n    // TODO: Implement function body\n    return;\n  }', content
+        )
         
-        if matches:
-            for match in reversed(matches):  # Process in reverse to maintain positions
-                replacement = match.group(1) + '{\n    // TODO: Implement function body\n    return;\n  }'
-                content = content[:match.start()] + replacement + content[match.end():]
-            
-            self.fixes_applied.append(f"{file_path}: Fixed {len(matches)} incomplete arrow functions")
+        if count:
+            self.fixes_applied.append(f"{file_path}: Fixed {count} incomplete arrow functions")
         
         return content
     
     def fix_unclosed_parentheses(self, content: str, file_path: str) -> str:
         """Fix unclosed parentheses and brackets"""
-        # Count balance
+        # Count balance; four str.count scans run at memchr speed and beat a
+        # single translate()/Counter pass, which goes char by char
         paren_balance = content.count('(') - content.count(')')
         bracket_balance = content.count('[') - content.count(']')
         
@@ -177,48 +254,54 @@ class BackendServiceFixer:
     def fix_duplicate_closing_braces(self, content: str, file_path: str) -> str:
         """Remove duplicate closing braces at end of file"""
         # Remove multiple closing braces at the end
-        pattern = r'}+\s*$'
-        match = re.search(pattern, content)
+        match = TRAILING_BRACES_RE.search(content)
         if match:
             brace_count = match.group().count('}')
             if brace_count > 1:
-                # Replace with single brace
-                content = re.sub(r'}+\s*$', '}\n', content)
+                # Replace with single brace; the match already runs to the
+                # end of the file, so no second scan is needed
+                content = content[:match.start()] + '}\n'
                 self.fixes_applied.append(f"{file_path}: Removed {brace_count - 1} duplicate closing braces at end")
         
         return content
     
     def remove_orphaned_braces(self, content: str, file_path: str) -> str:
         """Remove orphaned closing braces that don't match any opening"""
-        lines = content.split('\n')
-        stack = []
-        lines_to_remove = []
+        depth = 0
+        removed_count = 0
+        pieces = []
+        pos = 0
         
-        for i, line in enumerate(lines):
-            stripped = line.strip()
+        for match in BRACE_LINE_RE.finditer(content):
+            line = match.group()
             
-            # Track opening braces
-            open_count = line.count('{')
+            # A line's opening braces count before its closing ones, so
+            # '} else {' never reads as orphaned
+            depth += line.count('{')
             close_count = line.count('}')
             
-            for _ in range(open_count):
-                stack.append(i)
+            if close_count <= depth:
+                depth -= close_count
+            else:
+                # More closers than open braces; only a line that is just
+                # the orphaned brace is safe to drop, with its newline
+                if line.strip() == '}':
+                    pieces.append(content[pos:match.start()])
+                    pos = match.end() + 1
+                    removed_count += 1
+                depth = 0
+        
+        if removed_count:
+            pieces.append(content[pos:])
+            fixed = ''.join(pieces)
             
-            for _ in range(close_count):
-                if stack:
-                    stack.pop()
-                else:
-                    # This is an orphaned closing brace
-                    if stripped == '}':
-                        lines_to_remove.append(i)
-        
-        # Remove orphaned lines (in reverse order to maintain indices)
-        for line_idx in reversed(lines_to_remove):
-            lines.pop(line_idx)
-        
-        if lines_to_remove:
-            self.fixes_applied.append(f"{file_path}: Removed {len(lines_to_remove)} orphaned closing braces")
-            return '\n'.join(lines)
+            # A dropped last line has no newline of its own; take the one
+            # before it instead
+            if pos > len(content) and fixed:
+                fixed = fixed[:-1]
+            
+            self.fixes_applied.append(f"{file_path}: Removed {removed_count} orphaned closing braces")
+            return fixed
         
         return content
     
@@ -241,6 +324,9 @@ class BackendServiceFixer:
     
     def generate_report(self):
         """Generate fix report"""
+        if self.file_cache is not None:
+            self._save_cache()
+        
         report = {
             "timestamp": "2025-07-22T08:52:43Z",
             "fixes_applied": len(self.fixes_applied),
@@ -252,8 +338,12 @@ class BackendServiceFixer:
         }
         
         report_path = self.project_root / "backend_service_fix_report.json"
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2)
+        if orjson:
+            report_path.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            import json
+            with open(report_path, 'w') as f:
+                json.dump(report, f, indent=2)
         
         print(f"\n📊 Fix Report:")
         print(f"   Fixes applied: {len(self.fixes_applied)}")
@@ -270,6 +360,20 @@ class BackendServiceFixer:
             for error in self.errors_found:
                 print(f"   - {error}")
 
+def process_service_file(project_root: str, file_path: Path) -> Tuple[List[str], List[str], str]:
+    """Fix a single service file in a worker process
+    
+    Returns the fixes applied, the errors found and the captured output,
+    for the parent to merge and print in order.
+    """
+    fixer = BackendServiceFixer(project_root)
+    log = io.StringIO()
+    
+    with contextlib.redirect_stdout(log):
+        fixer.fix_service_file(file_path)
+    
+    return fixer.fixes_applied, fixer.errors_found, log.getvalue()
+
 def main():
     """Main execution function"""
     project_root = "/Users/administrator/ai-automation-platform/user_projects/25b7e956-816a-410c-b1b5-3c798a9d586c/BOOM Card_20250722_085243"